@@ -30,7 +30,8 @@ class AirplaneAdmin(admin.ModelAdmin):
 
 @admin.register(Airport)
 class AirportAdmin(admin.ModelAdmin):
-    list_display = ("name", "closest_big_city")
+    list_display = ("name", "closest_big_city", "latitude", "longitude")
+    readonly_fields = ("latitude", "longitude")
     search_fields = ("name",)
     list_per_page = 10
 
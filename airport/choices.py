@@ -40,3 +40,10 @@ class CrewRole(str, enum.Enum):
     @classmethod
     def choices(cls):
         return [(choice.value, choice.label) for choice in cls]
+
+
+class OrderRequestStatus(models.TextChoices):
+    PENDING = "PENDING", _("Pending")
+    PROCESSING = "PROCESSING", _("Processing")
+    DONE = "DONE", _("Done")
+    FAILED = "FAILED", _("Failed")
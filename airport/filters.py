@@ -1,5 +1,9 @@
+from datetime import date, datetime, time, timedelta
+
 from django.contrib import admin
+from django.utils import timezone
 from django_filters import rest_framework
+from django_filters.constants import EMPTY_VALUES
 
 from airport.models import (
     Flight,
@@ -10,6 +14,7 @@ from airport.models import (
     Ticket,
     Order
 )
+from airport.services.utils.gazetteer import normalize_city
 
 
 def custom_filter(field_name: str, lookup_expr: str, current_type: str):
@@ -21,6 +26,67 @@ def custom_filter(field_name: str, lookup_expr: str, current_type: str):
     return field_type(field_name=field_name, lookup_expr=lookup_expr)
 
 
+class CityFilter(rest_framework.CharFilter):
+    """Case-insensitive substring search on the city of an airport.
+
+    The search runs on the lowercase `Airport.city_normalized` column,
+    which is indexed (with a trigram GIN index on PostgreSQL, which
+    serves `LIKE '%x%'`), instead of `UPPER(closest_big_city)` on every
+    joined row. `airport` is the path to the airport, empty for the
+    airport itself.
+    """
+
+    def __init__(self, *args, airport="", **kwargs):
+        kwargs["field_name"] = "__".join(
+            part for part in (airport, "city_normalized") if part
+        )
+        kwargs["lookup_expr"] = "contains"
+        super().__init__(*args, **kwargs)
+
+    def filter(self, qs, value):
+        if value not in EMPTY_VALUES:
+            value = normalize_city(value)
+
+        return super().filter(qs, value)
+
+
+def day_bounds(value: date) -> tuple[datetime, datetime]:
+    start = timezone.make_aware(datetime.combine(value, time.min))
+
+    return start, start + timedelta(days=1)
+
+
+class DayFilter(rest_framework.DateFilter):
+    """Filter a DateTimeField by a calendar day of the current time zone.
+
+    The day is turned into a half-open range over the raw column, so
+    the database can use an index instead of casting every row.
+    `bound` selects the whole day ("exact"), everything from its start
+    ("after") or everything up to its end ("before").
+    """
+
+    def __init__(self, *args, bound="exact", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.bound = bound
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+
+        start, end = day_bounds(value)
+        lookups = {}
+
+        if self.bound in ("exact", "after"):
+            lookups[f"{self.field_name}__gte"] = start
+        if self.bound in ("exact", "before"):
+            lookups[f"{self.field_name}__lt"] = end
+
+        if self.distinct:
+            qs = qs.distinct()
+
+        return self.get_method(qs)(**lookups)
+
+
 class DistanceRangeFilterAdmin(admin.SimpleListFilter):
     title = "Distance Range"
     parameter_name = "distance_range"
@@ -48,26 +114,19 @@ class FlightFilter(rest_framework.FilterSet):
         field_name="airplane__name",
         lookup_expr="icontains",
         current_type="char")
-    departure_airport = custom_filter(
-        field_name="route__source__closest_big_city",
-        lookup_expr="icontains",
-        current_type="char"
-    )
-    arrival_airport = custom_filter(
-        field_name="route__destination__closest_big_city",
-        lookup_expr="icontains",
-        current_type="char"
-    )
-    departure_time = custom_filter(
+    departure_airport = CityFilter(airport="route__source")
+    arrival_airport = CityFilter(airport="route__destination")
+    departure_time = DayFilter(field_name="departure_time")
+    departure_date = DayFilter(field_name="departure_time")
+    departure_after = DayFilter(
         field_name="departure_time",
-        lookup_expr="icontains",
-        current_type="date"
+        bound="after"
     )
-    arrival_time = custom_filter(
-        field_name="arrival_time",
-        lookup_expr="icontains",
-        current_type="date"
+    departure_before = DayFilter(
+        field_name="departure_time",
+        bound="before"
     )
+    arrival_time = DayFilter(field_name="arrival_time")
 
     class Meta:
         model = Flight
@@ -76,6 +135,9 @@ class FlightFilter(rest_framework.FilterSet):
             "departure_airport",
             "arrival_airport",
             "departure_time",
+            "departure_date",
+            "departure_after",
+            "departure_before",
             "arrival_time"
         )
 
@@ -93,16 +155,8 @@ class CrewFilter(rest_framework.FilterSet):
 
 
 class RouteFilter(rest_framework.FilterSet):
-    source_city = custom_filter(
-        field_name="source__closest_big_city",
-        lookup_expr="icontains",
-        current_type="char"
-    )
-    destination_city = custom_filter(
-        field_name="destination__closest_big_city",
-        lookup_expr="icontains",
-        current_type="char"
-    )
+    source_city = CityFilter(airport="source")
+    destination_city = CityFilter(airport="destination")
 
     class Meta:
         model = Route
@@ -110,11 +164,7 @@ class RouteFilter(rest_framework.FilterSet):
 
 
 class AirportFilter(rest_framework.FilterSet):
-    name = custom_filter(
-        field_name="closest_big_city",
-        lookup_expr="icontains",
-        current_type="char"
-    )
+    name = CityFilter()
 
     class Meta:
         model = Airport
@@ -139,16 +189,8 @@ class AirplaneFilter(rest_framework.FilterSet):
 
 
 class TicketFilter(rest_framework.FilterSet):
-    flight_from = custom_filter(
-        field_name="flight__route__source__closest_big_city",
-        lookup_expr="icontains",
-        current_type="char"
-    )
-    flight_to = custom_filter(
-        field_name="flight__route__destination__closest_big_city",
-        lookup_expr="icontains",
-        current_type="char"
-    )
+    flight_from = CityFilter(airport="flight__route__source")
+    flight_to = CityFilter(airport="flight__route__destination")
 
     class Meta:
         model = Ticket
@@ -156,11 +198,7 @@ class TicketFilter(rest_framework.FilterSet):
 
 
 class OrderFilter(rest_framework.FilterSet):
-    created_at = custom_filter(
-        field_name="created_at",
-        lookup_expr="icontains",
-        current_type="date"
-    )
+    created_at = DayFilter(field_name="created_at")
 
     class Meta:
         model = Order
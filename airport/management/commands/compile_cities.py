@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from airport.services.utils.gazetteer import (
+    DATA_CITIES_PATH,
+    DATA_CITIES_COMPILED_PATH,
+    compile_cities,
+)
+
+
+class Command(BaseCommand):
+    help = "Compile the cities file into a memory-mapped lookup table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--source",
+            default=DATA_CITIES_PATH,
+            help="CSV file with cities (default: DATA_CITIES_PATH)"
+        )
+        parser.add_argument(
+            "--output",
+            default=DATA_CITIES_COMPILED_PATH,
+            help="Compiled file (default: DATA_CITIES_COMPILED_PATH)"
+        )
+
+    def handle(self, *args, **kwargs):
+        source = kwargs.get("source")
+        output = kwargs.get("output")
+
+        if not source or not output:
+            raise CommandError("The required file was not found.")
+
+        try:
+            count = compile_cities(source, output)
+        except FileNotFoundError as e:
+            raise CommandError(f"File not found: {e}")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Cities compiled to {output}: {count}")
+        )
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+
+from airport.models import Airport
+from airport.services.response_cache import bump_version_on_commit
+
+
+class Command(BaseCommand):
+    help = "Fill the coordinates of airports saved without them"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of airports updated per query (default: 500)"
+        )
+
+    def handle(self, *args, **kwargs):
+        batch_size = kwargs.get("batch_size")
+        last_id = 0
+        updated = skipped = 0
+
+        while True:
+            airports = list(
+                Airport.objects.filter(latitude__isnull=True, id__gt=last_id)
+                .order_by("id")[:batch_size]
+            )
+
+            if not airports:
+                break
+
+            last_id = airports[-1].id
+            known = [airport for airport in airports if airport.set_coordinates()]
+            skipped += len(airports) - len(known)
+
+            Airport.objects.bulk_update(
+                known, ("latitude", "longitude", "city_normalized")
+            )
+            updated += len(known)
+
+        # bulk_update sends no signals
+        if updated:
+            bump_version_on_commit(Airport)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Airports updated: {updated}, "
+                f"skipped with an unknown city: {skipped}"
+            )
+        )
@@ -2,6 +2,15 @@ from django.core.exceptions import ValidationError
 from django.core.management.base import BaseCommand
 from django.db import IntegrityError
 
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Crew,
+    Flight,
+    Route,
+)
+from airport.pagination import drop_row_count
 from airport.services.db_population import (
     add_airports,
     add_routes,
@@ -12,6 +21,7 @@ from airport.services.db_population import (
     add_flights,
     add_tickets
 )
+from airport.services.response_cache import bump_version_on_commit
 
 
 class Command(BaseCommand):
@@ -54,4 +64,10 @@ class Command(BaseCommand):
         except Exception as e:
             print(f"An unexpected error occurred: {e}")
         else:
+            # bulk_create sends no signals, so drop cached responses
+            # and row counts
+            for model in (Airplane, AirplaneType, Airport, Crew, Flight, Route):
+                drop_row_count(model)
+                bump_version_on_commit(model)
+
             print("The database was filled successfully")
@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from airport.services.order_queue import process_queue
+
+
+class Command(BaseCommand):
+    help = "Create the orders queued by the asynchronous intake"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of worker threads (default: 4)"
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=20,
+            help="Number of requests a worker claims at once (default: 20)"
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help=(
+                "Keep polling the queue every INTERVAL seconds "
+                "(default: 0, drain it once and exit)"
+            )
+        )
+
+    def handle(self, *args, **kwargs):
+        workers = kwargs.get("workers")
+        batch_size = kwargs.get("batch_size")
+        interval = kwargs.get("interval")
+
+        while True:
+            processed = process_queue(workers, batch_size)
+
+            if processed or not interval:
+                self.stdout.write(
+                    self.style.SUCCESS(f"Order requests processed: {processed}")
+                )
+
+            if not interval:
+                break
+
+            time.sleep(interval)
@@ -0,0 +1,76 @@
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from airport.models import Route
+from airport.services.response_cache import bump_version_on_commit
+from airport.services.utils.distance_calcultion import calculate_distances
+
+
+class Command(BaseCommand):
+    help = "Recompute distances of all routes from airport coordinates"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of routes processed per query (default: 5000)"
+        )
+
+    def handle(self, *args, **kwargs):
+        batch_size = kwargs.get("batch_size")
+        last_id = 0
+        updated = skipped = 0
+
+        while True:
+            rows = list(
+                Route.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list(
+                    "id",
+                    "distance",
+                    "source__latitude",
+                    "source__longitude",
+                    "destination__latitude",
+                    "destination__longitude",
+                )[:batch_size]
+            )
+
+            if not rows:
+                break
+
+            last_id = rows[-1][0]
+            ids, distances, *coords = zip(*rows)
+            coords = [np.array(values, dtype=np.float64) for values in coords]
+
+            new_distances = calculate_distances(*coords)
+            known = ~np.isnan(new_distances)
+            skipped += int((~known).sum())
+
+            # int() truncates the same way saving a float distance does
+            now = timezone.now()
+            routes = [
+                Route(id=route_id, distance=int(distance), updated_at=now)
+                for route_id, old_distance, distance, is_known in zip(
+                    ids, distances, new_distances, known
+                )
+                if is_known and int(distance) != old_distance
+            ]
+
+            with transaction.atomic():
+                Route.objects.bulk_update(routes, ("distance", "updated_at"))
+
+            updated += len(routes)
+
+        # bulk_update sends no signals
+        if updated:
+            bump_version_on_commit(Route)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Routes updated: {updated}, "
+                f"skipped without coordinates: {skipped}"
+            )
+        )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from airport.services.seat_counters import reconcile_seats_sold
+
+
+class Command(BaseCommand):
+    help = "Recount sold seats of flights whose counter has drifted"
+
+    def handle(self, *args, **kwargs):
+        repaired = reconcile_seats_sold()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Flight seat counters repaired: {repaired}")
+        )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from airport.services.idempotency import sweep_expired_keys
+
+
+class Command(BaseCommand):
+    help = "Delete expired idempotency keys in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of keys deleted per query (default: 1000)"
+        )
+
+    def handle(self, *args, **kwargs):
+        deleted = sweep_expired_keys(kwargs.get("batch_size"))
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Expired idempotency keys deleted: {deleted}")
+        )
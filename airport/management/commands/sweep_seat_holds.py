@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from airport.services.seat_holds import sweep_expired_holds
+
+
+class Command(BaseCommand):
+    help = "Delete expired seat holds in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of holds deleted per query (default: 1000)"
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help=(
+                "Keep sweeping every INTERVAL seconds "
+                "(default: 0, sweep once and exit)"
+            )
+        )
+
+    def handle(self, *args, **kwargs):
+        batch_size = kwargs.get("batch_size")
+        interval = kwargs.get("interval")
+
+        while True:
+            deleted = sweep_expired_holds(batch_size)
+
+            self.stdout.write(
+                self.style.SUCCESS(f"Expired seat holds deleted: {deleted}")
+            )
+
+            if not interval:
+                break
+
+            time.sleep(interval)
@@ -0,0 +1,62 @@
+from django.db import migrations, models
+
+
+BATCH_SIZE = 500
+
+
+def backfill_coordinates(apps, schema_editor):
+    Airport = apps.get_model("airport", "Airport")
+    airports = list(
+        Airport.objects.filter(latitude__isnull=True).only(
+            "id", "closest_big_city"
+        )
+    )
+
+    if not airports:
+        return
+
+    from airport.services.utils.distance_calcultion import lookup_city
+
+    updated = []
+
+    try:
+        for airport in airports:
+            city_coords = lookup_city(airport.closest_big_city)
+
+            if city_coords is None:
+                continue
+
+            airport.latitude = city_coords["lat"]
+            airport.longitude = city_coords["lng"]
+            updated.append(airport)
+    except OSError:
+        # No cities file is configured: the coordinates are filled later
+        # by `python manage.py fill_airport_coordinates`
+        return
+
+    Airport.objects.bulk_update(
+        updated, ("latitude", "longitude"), batch_size=BATCH_SIZE
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0002_alter_airport_unique_together_alter_crew_role_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="airport",
+            name="latitude",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="airport",
+            name="longitude",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(
+            backfill_coordinates, reverse_code=migrations.RunPython.noop
+        ),
+    ]
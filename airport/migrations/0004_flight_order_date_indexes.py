@@ -0,0 +1,33 @@
+# Generated by Django 5.1.4 on 2026-10-18 11:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0003_airport_latitude_airport_longitude"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                fields=["departure_time"], name="flight_departure_time_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                fields=["arrival_time"], name="flight_arrival_time_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["user", "created_at"], name="order_user_created_at_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.1.4 on 2026-10-18 11:08
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_sold_seats(apps, schema_editor):
+    Flight = apps.get_model("airport", "Flight")
+    Ticket = apps.get_model("airport", "Ticket")
+
+    Flight.objects.update(
+        seats_sold=Coalesce(
+            Subquery(
+                Ticket.objects.filter(flight=OuterRef("pk"))
+                .order_by()
+                .values("flight")
+                .annotate(count=Count("id"))
+                .values("count")
+            ),
+            0,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0004_flight_order_date_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="flight",
+            name="seats_sold",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            count_sold_seats, reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.4 on 2026-10-18 11:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0006_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                fields=["route", "departure_time"],
+                name="flight_route_departure_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                fields=["route", "arrival_time"],
+                name="flight_route_arrival_idx",
+            ),
+        ),
+    ]
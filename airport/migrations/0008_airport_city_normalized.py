@@ -0,0 +1,65 @@
+# Generated by Django 5.1.4 on 2026-10-18 11:24
+
+from django.db import migrations, models
+
+from airport.services.utils.gazetteer import normalize_city
+
+
+BATCH_SIZE = 500
+
+
+def fill_city_normalized(apps, schema_editor):
+    # Normalized in Python like Airport.save(): SQL LOWER() of SQLite
+    # only folds ASCII letters
+    Airport = apps.get_model("airport", "Airport")
+    airports = Airport.objects.only("id", "closest_big_city").order_by("id")
+    batch = []
+
+    for airport in airports.iterator(chunk_size=BATCH_SIZE):
+        airport.city_normalized = normalize_city(airport.closest_big_city)
+        batch.append(airport)
+
+        if len(batch) == BATCH_SIZE:
+            Airport.objects.bulk_update(batch, ("city_normalized",))
+            batch = []
+
+    Airport.objects.bulk_update(batch, ("city_normalized",))
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS airport_city_trgm_idx "
+        "ON airport_airport USING gin (city_normalized gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("DROP INDEX IF EXISTS airport_city_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0007_flight_route_time_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="airport",
+            name="city_normalized",
+            field=models.CharField(
+                blank=True, db_index=True, editable=False, max_length=63
+            ),
+        ),
+        migrations.RunPython(
+            fill_city_normalized, reverse_code=migrations.RunPython.noop
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-18 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0011_orderrequest"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="idempotencykey",
+            name="locked_until",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
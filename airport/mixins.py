@@ -0,0 +1,169 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+from airport.services.response_cache import (
+    get_response_cache,
+    response_cache_key,
+)
+
+
+def view_cache_prefix(view, request) -> str:
+    return ":".join((
+        view.basename,
+        view.action,
+        str(view.kwargs.get(view.lookup_url_kwarg or view.lookup_field)),
+        request.get_host(),
+    ))
+
+
+class CachedResponseMixin:
+    """Cache `list` and `retrieve` responses until a model changes.
+
+    `cache_models` lists every model whose data ends up in the
+    response. Saving or deleting any of them bumps its version (see
+    `airport.signals`), which changes the key of every cached response
+    built from it.
+    """
+
+    cache_models = ()
+
+    def get_cache_key(self, request) -> str:
+        return response_cache_key(
+            view_cache_prefix(self, request),
+            self.cache_models,
+            request.query_params,
+        )
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        cache = get_response_cache()
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+
+        if data is not None:
+            return Response(data, headers={"X-Cache": "HIT"})
+
+        response = handler(request, *args, **kwargs)
+
+        if response.status_code == 200:
+            cache.set(key, response.data)
+            response["X-Cache"] = "MISS"
+
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class ConditionalGetMixin:
+    """Answer `list` and `retrieve` with 304 when `If-None-Match` matches.
+
+    The ETag is built from the number of matching rows, the latest
+    `updated_at` among them and every relation in `etag_fields`, and
+    the query string, all read with one aggregate query. The result is
+    kept in the response cache under the versions of `etag_models`
+    (`cache_models` by default), so the aggregate runs once per change
+    of those models. A 304 skips serialization entirely.
+    `Last-Modified` is sent for information only: a deletion does not
+    move it, so only the ETag decides.
+    """
+
+    etag_fields = ("updated_at",)
+    etag_models = None
+
+    def get_etag_fields(self) -> tuple[str, ...]:
+        return self.etag_fields
+
+    def get_etag_models(self) -> tuple:
+        if self.etag_models is not None:
+            return self.etag_models
+
+        return getattr(self, "cache_models", ()) or (self.queryset.model,)
+
+    def get_validators(self, request):
+        cache = get_response_cache()
+        key = response_cache_key(
+            f"etag:{view_cache_prefix(self, request)}",
+            self.get_etag_models(),
+            request.query_params,
+        )
+        validators = cache.get(key)
+
+        if validators is None:
+            validators = self.compute_validators(request)
+            cache.set(key, validators)
+
+        return validators
+
+    def compute_validators(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        if self.action == "retrieve":
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+
+        aggregates = {
+            f"updated_at_{index}": Max(field)
+            for index, field in enumerate(self.get_etag_fields())
+        }
+        result = queryset.order_by().aggregate(
+            count=Count("pk", distinct=True), **aggregates
+        )
+        count = result.pop("count")
+        last_modified = max(
+            (value for value in result.values() if value is not None),
+            default=None,
+        )
+
+        digest = hashlib.md5(
+            "|".join((
+                self.basename,
+                self.action,
+                request.get_full_path(),
+                request.get_host(),
+                str(count),
+                last_modified.isoformat() if last_modified else "",
+            )).encode(),
+            usedforsecurity=False,
+        ).hexdigest()
+
+        return quote_etag(digest), last_modified
+
+    def get_conditional_get_response(self, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        response = get_conditional_response(request, etag=etag)
+
+        if response is None:
+            response = handler(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(
+                    last_modified.timestamp()
+                )
+
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_get_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_get_response(
+            super().retrieve, request, *args, **kwargs
+        )
@@ -6,14 +6,15 @@ from django.db.models import UniqueConstraint
 from airport.choices import (
     AirplaneName,
     AirplaneTypeName,
-    CrewRole
+    CrewRole,
+    OrderRequestStatus,
 )
 from airport.services.utils.airplane_image import airplane_image_file_path
-from airport.services.utils.city_verification import get_city
 from airport.services.utils.distance_calcultion import (
-    get_coord,
-    calculate_distance
+    calculate_distance,
+    lookup_city,
 )
+from airport.services.utils.gazetteer import normalize_city
 
 
 class Flight(models.Model):
@@ -30,13 +31,43 @@ class Flight(models.Model):
     departure_time = models.DateTimeField()
     arrival_time = models.DateTimeField()
     crew = models.ManyToManyField(to="Crew", related_name="crew_flights")
+    seats_sold = models.PositiveIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ("route", "departure_time")
+        indexes = [
+            models.Index(
+                fields=("departure_time",),
+                name="flight_departure_time_idx"
+            ),
+            models.Index(
+                fields=("arrival_time",),
+                name="flight_arrival_time_idx"
+            ),
+            models.Index(
+                fields=("route", "departure_time"),
+                name="flight_route_departure_idx"
+            ),
+            models.Index(
+                fields=("route", "arrival_time"),
+                name="flight_route_arrival_idx"
+            ),
+        ]
 
     def __str__(self) -> str:
         return str(self.route)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_calendar = (
+            instance.__dict__.get("route_id"),
+            instance.__dict__.get("departure_time"),
+        )
+
+        return instance
+
     @staticmethod
     def validate_time(
             departure_time,
@@ -63,6 +94,15 @@ class Flight(models.Model):
         **kwargs
     ):
         self.full_clean()
+
+        if not self._state.adding and update_fields is None:
+            # seats_sold is maintained with atomic UPDATEs by the ticket
+            # signals, so a stale copy in memory must not overwrite it.
+            update_fields = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "seats_sold"
+            ]
+
         return super(Flight, self).save(
             force_insert, force_update, using, update_fields, **kwargs
         )
@@ -75,6 +115,7 @@ class Crew(models.Model):
         max_length=63,
         choices=CrewRole.choices(),
     )
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ("role",)
@@ -101,6 +142,7 @@ class Route(models.Model):
     distance = models.PositiveIntegerField(
         help_text="Enter the distance between airports in kilometers."
     )
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self) -> str:
         return f"{self.source} → {self.destination}"
@@ -115,15 +157,16 @@ class Route(models.Model):
                 "Departure and arrival points cannot be the same."
             )
 
-        try:
-            self.distance = calculate_distance(
-                source_coords=get_coord(self.source.closest_big_city),
-                destination_coords=get_coord(
-                    self.destination.closest_big_city
-                )
+        if not (self.source.has_coordinates
+                and self.destination.has_coordinates):
+            raise ValidationError(
+                "Error calculating distance: "
+                "coordinates of the airports are unknown."
             )
-        except ValidationError as e:
-            raise ValidationError(f"Error calculating distance: {e}")
+
+        self.distance = calculate_distance(
+            self.source.coordinates, self.destination.coordinates
+        )
 
     def save(
         self,
@@ -142,6 +185,15 @@ class Route(models.Model):
 class Airport(models.Model):
     name = models.CharField(max_length=127)
     closest_big_city = models.CharField(max_length=63)
+    city_normalized = models.CharField(
+        max_length=63,
+        blank=True,
+        db_index=True,
+        editable=False
+    )
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self) -> str:
         return f"{self.name} ({self.closest_big_city})"
@@ -155,10 +207,29 @@ class Airport(models.Model):
             )
         ]
 
-    def clean(self):
-        is_existing_city = get_city(self.closest_big_city)
+    @property
+    def has_coordinates(self) -> bool:
+        return self.latitude is not None and self.longitude is not None
+
+    @property
+    def coordinates(self) -> dict:
+        return {"lat": self.latitude, "lng": self.longitude}
+
+    def set_coordinates(self) -> bool:
+        """Fill the fields derived from the city, False if it is unknown."""
+        self.city_normalized = normalize_city(self.closest_big_city)
+        city_coords = lookup_city(self.closest_big_city)
+
+        if city_coords is None:
+            return False
+
+        self.latitude = city_coords["lat"]
+        self.longitude = city_coords["lng"]
+
+        return True
 
-        if not is_existing_city:
+    def clean(self):
+        if not self.set_coordinates():
             raise ValidationError("The entered city does not exist.")
 
     def save(
@@ -192,6 +263,7 @@ class Airplane(models.Model):
         blank=True,
         upload_to=airplane_image_file_path,
     )
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ("name",)
@@ -233,6 +305,7 @@ class AirplaneType(models.Model):
         max_length=3,
         choices=AirplaneTypeName.choices
     )
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self) -> str:
         return f"{self.get_name_display()} ({self.name})"
@@ -257,6 +330,16 @@ class Ticket(models.Model):
     class Meta:
         unique_together = ("row", "seat", "flight")
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+
+        # A deferred flight is loaded later and counts as unchanged
+        if "flight_id" in field_names:
+            instance._loaded_flight_id = instance.flight_id
+
+        return instance
+
     @staticmethod
     def validate_ticket(row, seat, airplane, error_to_raise):
         if (not 1 <= row <= airplane.rows
@@ -292,7 +375,9 @@ class Ticket(models.Model):
         update_fields=None,
         **kwargs
     ):
-        self.full_clean()
+        # The unique constraint on (row, seat, flight) is checked by the
+        # database instead, see airport.services.seat_inventory
+        self.full_clean(validate_unique=False)
         return super(Ticket, self).save(
             force_insert, force_update, using, update_fields, **kwargs
         )
@@ -306,8 +391,108 @@ class Order(models.Model):
         related_name="orders"
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=("user", "created_at"),
+                name="order_user_created_at_idx"
+            ),
+        ]
+
     def __str__(self) -> str:
         return (
             f"{self.user} "
             f"(create at: {self.created_at.strftime('%d-%m-%Y %H:%M')})"
         )
+
+
+class SeatHold(models.Model):
+    flight = models.ForeignKey(
+        to=Flight,
+        on_delete=models.CASCADE,
+        related_name="seat_holds"
+    )
+    row = models.PositiveIntegerField()
+    seat = models.PositiveIntegerField()
+    token = models.UUIDField(db_index=True)
+    user = models.ForeignKey(
+        to=settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="seat_holds"
+    )
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(
+                fields=("flight", "row", "seat"),
+                name="Unique hold of a seat"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return (
+            f"{str(self.flight)} (row: {self.row}, seat: {self.seat}, "
+            f"until: {self.expires_at.strftime('%d-%m-%Y %H:%M')})"
+        )
+
+
+class IdempotencyKey(models.Model):
+    user = models.ForeignKey(
+        to=settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="idempotency_keys"
+    )
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(
+                fields=("user", "key"),
+                name="Unique idempotency key of a user"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user} ({self.key})"
+
+
+class OrderRequest(models.Model):
+    user = models.ForeignKey(
+        to=settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="order_requests"
+    )
+    payload = models.JSONField()
+    status = models.CharField(
+        max_length=15,
+        choices=OrderRequestStatus.choices,
+        default=OrderRequestStatus.PENDING
+    )
+    order = models.OneToOneField(
+        to=Order,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="request"
+    )
+    errors = models.JSONField(null=True, blank=True)
+    worker = models.UUIDField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=("status", "created_at"),
+                name="order_request_status_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user} ({self.get_status_display()})"
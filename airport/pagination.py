@@ -1,7 +1,286 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from datetime import date, datetime, time
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import EmptyPage, Page, Paginator
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from airport.services.response_cache import get_response_cache
 
 
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 10
+
+
+def row_count_cache_key(model) -> str:
+    return f"row-count:{model._meta.label_lower}"
+
+
+def drop_row_count(model) -> None:
+    """Drop the cached count of `model` once the transaction commits."""
+    transaction.on_commit(
+        lambda: get_response_cache().delete(row_count_cache_key(model))
+    )
+
+
+def estimate_table_rows(model) -> int | None:
+    """Planner estimate of the table size, available on PostgreSQL."""
+    if connection.vendor != "postgresql":
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [model._meta.db_table],
+        )
+        row = cursor.fetchone()
+
+    # reltuples is -1 until the table has been vacuumed or analyzed
+    if row is None or row[0] < 0:
+        return None
+
+    return row[0]
+
+
+class ApproximateCountPage(Page):
+    has_more = False
+
+    def has_next(self):
+        return self.has_more
+
+
+class ApproximateCountPaginator(Paginator):
+    """Paginator that never runs an unbounded COUNT(*) on a filter.
+
+    Unfiltered querysets are counted with the PostgreSQL estimate for
+    big tables, or an exact count cached for `cache_timeout` seconds
+    and dropped by the model signals. Filtered querysets are counted up
+    to `cap` rows only. Whether there is a next page is decided by
+    fetching one extra row, so pages past an approximate count still
+    work.
+    """
+
+    cap = 1000
+    cache_timeout = 60
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.is_approximate = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+
+        if queryset.query.where:
+            count = queryset[:self.cap + 1].count()
+            self.is_approximate = count > self.cap
+
+            return min(count, self.cap)
+
+        model = queryset.model
+        estimate = estimate_table_rows(model)
+
+        if estimate is not None and estimate > self.cap:
+            self.is_approximate = True
+
+            return estimate
+
+        # Kept in the response cache, which is shared between workers
+        return get_response_cache().get_or_set(
+            row_count_cache_key(model), queryset.count, self.cache_timeout
+        )
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if self.is_approximate and int(number) >= 1:
+                return int(number)
+
+            raise
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        page = ApproximateCountPage(rows[:self.per_page], number, self)
+        page.has_more = len(rows) > self.per_page
+
+        return page
+
+
+class ApproximateCountPagination(StandardResultsSetPagination):
+    django_paginator_class = ApproximateCountPaginator
+
+    def get_paginated_response(self, data):
+        return Response({
+            "count": self.page.paginator.count,
+            "count_approximate": self.page.paginator.is_approximate,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_approximate"] = {
+            "type": "boolean",
+            "example": False,
+        }
+
+        return response_schema
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor pagination over a composite, index-backed ordering.
+
+    DRF's CursorPagination positions on the first ordering field only
+    and skips ties with an offset. Here the opaque cursor holds the
+    values of every ordering field of the boundary row, so any page is
+    one range scan `WHERE a > x OR (a = x AND b > y) ORDER BY a, b
+    LIMIT n` and costs the same as the first. The last ordering field
+    must be unique.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 10
+    ordering = ("id",)
+
+    def get_fields(self, reverse: bool) -> list[tuple[str, bool]]:
+        return [
+            (field.lstrip("-"), field.startswith("-") != reverse)
+            for field in self.ordering
+        ]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+
+        if not self.page_size:
+            return None
+
+        position, reverse = (
+            self.decode_cursor(request, queryset.model) or (None, False)
+        )
+        fields = self.get_fields(reverse)
+        queryset = queryset.order_by(
+            *(f"-{name}" if descending else name
+              for name, descending in fields)
+        )
+
+        if position is not None:
+            queryset = queryset.filter(self.seek(fields, position))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if reverse:
+            self.page.reverse()
+
+        self.has_next = has_more if not reverse else True
+        self.has_previous = position is not None if not reverse else has_more
+        self.display_page_controls = self.has_next or self.has_previous
+
+        return self.page
+
+    @staticmethod
+    def seek(fields: list[tuple[str, bool]], position: list) -> Q:
+        condition = Q()
+
+        for index, (name, descending) in enumerate(fields):
+            lookup = "lt" if descending else "gt"
+            step = Q(**{f"{name}__{lookup}": position[index]})
+
+            for (equal_name, _), value in zip(fields[:index], position):
+                step &= Q(**{equal_name: value})
+
+            condition |= step
+
+        return condition
+
+    def get_position(self, instance) -> list:
+        position = []
+
+        for field in self.ordering:
+            value = getattr(instance, field.lstrip("-"))
+
+            if isinstance(value, (date, datetime, time)):
+                value = value.isoformat()
+
+            position.append(value)
+
+        return position
+
+    def decode_cursor(self, request, model):
+        """Position and direction of the cursor, parsed by `model` fields."""
+        encoded = request.query_params.get(self.cursor_query_param)
+
+        if encoded is None:
+            return None
+
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            position, reverse = cursor["p"], bool(cursor["r"])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(position, list) or (
+                len(position) != len(self.ordering)):
+            raise NotFound(self.invalid_cursor_message)
+
+        try:
+            position = [
+                model._meta.get_field(name).to_python(value)
+                for (name, _), value in zip(self.get_fields(False), position)
+            ]
+        except (DjangoValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if None in position:
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, reverse
+
+    def encode_cursor(self, position: list, reverse: bool) -> str:
+        cursor = json.dumps({"p": position, "r": int(reverse)})
+        encoded = base64.urlsafe_b64encode(cursor.encode()).decode()
+
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded
+        )
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+
+        return self.encode_cursor(self.get_position(self.page[-1]), False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+
+        return self.encode_cursor(self.get_position(self.page[0]), True)
+
+
+class FlightPagination(KeysetPagination):
+    ordering = ("departure_time", "id")
+
+
+class TicketPagination(KeysetPagination):
+    ordering = ("id",)
+
+
+class OrderPagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
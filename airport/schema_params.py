@@ -23,15 +23,33 @@ FLIGHT_LIST_PARAMETERS = [
     ),
     OpenApiParameter(
         name="departure_time",
-        description="Filter by departure time (YYYY-MM-DD)",
+        description="Filter by departure date (YYYY-MM-DD)",
+        required=False,
+        type=OpenApiTypes.DATE,
+    ),
+    OpenApiParameter(
+        name="departure_date",
+        description="Filter by departure date (YYYY-MM-DD)",
+        required=False,
+        type=OpenApiTypes.DATE,
+    ),
+    OpenApiParameter(
+        name="departure_after",
+        description="Flights departing on or after the date (YYYY-MM-DD)",
+        required=False,
+        type=OpenApiTypes.DATE,
+    ),
+    OpenApiParameter(
+        name="departure_before",
+        description="Flights departing on or before the date (YYYY-MM-DD)",
         required=False,
         type=OpenApiTypes.DATE,
     ),
     OpenApiParameter(
         name="arrival_time",
-        description="Filter by arrival time (YYYY-MM-DD)",
+        description="Filter by arrival date (YYYY-MM-DD)",
         required=False,
-        type=OpenApiTypes.STR,
+        type=OpenApiTypes.DATE,
     ),
 ]
 
@@ -59,6 +77,24 @@ ROUTE_LIST_PARAMETERS = [
     )
 ]
 
+ROUTE_DISTANCE_MATRIX_PARAMETERS = [
+    OpenApiParameter(
+        name="ids",
+        description="Comma-separated airport ids (max: 200)",
+        required=True,
+        type=OpenApiTypes.STR,
+    )
+]
+
+ROUTE_CALENDAR_PARAMETERS = [
+    OpenApiParameter(
+        name="month",
+        description="Month in YYYY-MM format",
+        required=True,
+        type=OpenApiTypes.STR,
+    )
+]
+
 AIRPORT_LIST_PARAMETERS = [
     OpenApiParameter(
         name="name",
@@ -68,6 +104,63 @@ AIRPORT_LIST_PARAMETERS = [
     )
 ]
 
+AIRPORT_NEARBY_PARAMETERS = [
+    OpenApiParameter(
+        name="lat",
+        description="Latitude of the point",
+        required=True,
+        type=OpenApiTypes.FLOAT,
+    ),
+    OpenApiParameter(
+        name="lng",
+        description="Longitude of the point",
+        required=True,
+        type=OpenApiTypes.FLOAT,
+    ),
+    OpenApiParameter(
+        name="radius",
+        description="Search radius in kilometers",
+        required=True,
+        type=OpenApiTypes.FLOAT,
+    ),
+    OpenApiParameter(
+        name="limit",
+        description="Maximum number of airports (default: 10, max: 100)",
+        required=False,
+        type=OpenApiTypes.INT,
+    ),
+]
+
+AIRPORT_BOARD_PARAMETERS = [
+    OpenApiParameter(
+        name="hours",
+        description="Time window from now in hours (default: 6, max: 48)",
+        required=False,
+        type=OpenApiTypes.INT,
+    ),
+    OpenApiParameter(
+        name="limit",
+        description="Maximum number of flights (default: 20, max: 100)",
+        required=False,
+        type=OpenApiTypes.INT,
+    ),
+]
+
+CITY_AUTOCOMPLETE_PARAMETERS = [
+    OpenApiParameter(
+        name="q",
+        description="Beginning of the city name (any spelling)",
+        required=True,
+        type=OpenApiTypes.STR,
+    ),
+    OpenApiParameter(
+        name="limit",
+        description="Maximum number of cities (default: 10, max: 50)",
+        required=False,
+        type=OpenApiTypes.INT,
+    ),
+]
+
 AIRPLANE_LIST_PARAMETERS = [
     OpenApiParameter(
         name="name",
@@ -101,8 +194,21 @@ TICKET_LIST_PARAMETERS = [
 ORDER_LIST_PARAMETERS = [
     OpenApiParameter(
         name="created_at",
-        description="Filter by creation time (YYYY-MM-DD)",
+        description="Filter by creation date (YYYY-MM-DD)",
+        required=False,
+        type=OpenApiTypes.DATE,
+    )
+]
+
+ORDER_CREATE_PARAMETERS = [
+    OpenApiParameter(
+        name="Idempotency-Key",
+        description=(
+            "Unique key of the request; retries with the same key "
+            "replay the first successful response"
+        ),
         required=False,
         type=OpenApiTypes.STR,
+        location=OpenApiParameter.HEADER,
     )
 ]
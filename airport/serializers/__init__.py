@@ -1,17 +1,41 @@
 from .airplane_serializers import AirplaneSerializer
 from .airplane_type_serializers import AirplaneTypeSerializer
-from .airport_serializers import AirportSerializer
+from .airport_serializers import (
+    AirportSerializer,
+    AirportNearbyQuerySerializer,
+    AirportNearbySerializer,
+    AirportBoardQuerySerializer,
+    AirportImportRowSerializer,
+    AirportImportSerializer,
+    AirportImportResultSerializer,
+)
+from .city_serializers import CityAutocompleteQuerySerializer, CitySerializer
 from .crew_serializers import CrewSerializer
 from .flight_serializers import (
     FlightSerializer,
     FlightListSerializer,
     FlightDetailSerializer,
+    FlightBoardSerializer,
+    FlightSeatMapSerializer,
+)
+from .order_serializers import (
+    OrderSerializer,
+    OrderListSerializer,
+    OrderIntakeSerializer,
+    OrderRequestSerializer,
 )
-from .order_serializers import OrderSerializer, OrderListSerializer
 from .route_serializers import (
     RouteSerializer,
     RouteListSerializer,
     RouteDetailSerializer,
+    RouteDistanceMatrixQuerySerializer,
+    RouteDistanceMatrixSerializer,
+    RouteCalendarQuerySerializer,
+    RouteCalendarDaySerializer,
+)
+from .seat_hold_serializers import (
+    SeatHoldCreateSerializer,
+    SeatHoldSerializer,
 )
 from .ticket_serializers import (
     TicketSerializer,
@@ -7,7 +7,8 @@ from airport.models import Airport
 class AirportSerializer(serializers.ModelSerializer):
     class Meta:
         model = Airport
-        fields = ("id", "name", "closest_big_city")
+        fields = ("id", "name", "closest_big_city", "latitude", "longitude")
+        read_only_fields = ("id", "latitude", "longitude")
         validators = [
             UniqueTogetherValidator(
                 queryset=Airport.objects.all(),
@@ -25,3 +26,44 @@ class AirportSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError
 
         return attrs
+
+
+class AirportNearbyQuerySerializer(serializers.Serializer):
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    lng = serializers.FloatField(min_value=-180, max_value=180)
+    radius = serializers.FloatField(min_value=0, max_value=20_100)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+
+class AirportNearbySerializer(AirportSerializer):
+    distance = serializers.FloatField(read_only=True)
+
+    class Meta(AirportSerializer.Meta):
+        fields = AirportSerializer.Meta.fields + ("distance",)
+
+
+class AirportBoardQuerySerializer(serializers.Serializer):
+    hours = serializers.IntegerField(min_value=1, max_value=48, default=6)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+
+class AirportImportRowSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=127)
+    closest_big_city = serializers.CharField(max_length=63)
+
+
+class AirportImportSerializer(serializers.Serializer):
+    file = serializers.FileField(  # noqa: VNE002
+        help_text="CSV file with `name` and `closest_big_city` columns"
+    )
+
+
+class AirportImportErrorSerializer(serializers.Serializer):
+    row = serializers.IntegerField()
+    errors = serializers.DictField()
+
+
+class AirportImportResultSerializer(serializers.Serializer):
+    total = serializers.IntegerField()
+    created = serializers.IntegerField()
+    errors = AirportImportErrorSerializer(many=True)
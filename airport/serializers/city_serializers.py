@@ -0,0 +1,15 @@
+from rest_framework import serializers
+
+
+class CityAutocompleteQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=63)  # noqa: VNE001
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+
+class CitySerializer(serializers.Serializer):
+    name = serializers.CharField()
+    local_name = serializers.CharField()
+    country = serializers.CharField()
+    population = serializers.IntegerField()
+    lat = serializers.FloatField()
+    lng = serializers.FloatField()
@@ -91,3 +91,51 @@ class FlightDetailSerializer(FlightSerializer):
             "crew",
             "taken_seats"
         )
+
+
+class FlightBoardSerializer(serializers.ModelSerializer):
+    departure_airport = serializers.CharField(
+        source="route.source.name",
+        read_only=True
+    )
+    departure_city = serializers.CharField(
+        source="route.source.closest_big_city",
+        read_only=True
+    )
+    arrival_airport = serializers.CharField(
+        source="route.destination.name",
+        read_only=True
+    )
+    arrival_city = serializers.CharField(
+        source="route.destination.closest_big_city",
+        read_only=True
+    )
+    airplane_name = serializers.CharField(
+        source="airplane.name",
+        read_only=True
+    )
+
+    class Meta:
+        model = Flight
+        fields = (
+            "id",
+            "departure_airport",
+            "departure_city",
+            "arrival_airport",
+            "arrival_city",
+            "airplane_name",
+            "departure_time",
+            "arrival_time",
+        )
+
+
+class FlightSeatMapSerializer(serializers.Serializer):
+    rows = serializers.IntegerField()
+    seats_in_row = serializers.IntegerField()
+    seats_taken = serializers.IntegerField()
+    taken = serializers.CharField(
+        help_text=(
+            "Base64 bitset of taken seats in row-major order, "
+            "bit i is (byte i // 8) >> (i % 8) & 1"
+        )
+    )
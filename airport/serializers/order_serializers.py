@@ -1,34 +1,170 @@
 from django.db import transaction
 from rest_framework import serializers
 
-from airport.models import Order, Ticket
+from airport.models import Order, OrderRequest, Ticket
 from airport.serializers.ticket_serializers import (
+    FlightField,
     TicketSerializer,
     TicketListSerializer
 )
+from airport.services.seat_assignment import assign_seats
+from airport.services.seat_counters import count_created_tickets
+from airport.services.seat_holds import check_holds, release_hold
+from airport.services.seat_inventory import reserve_seats
+
+
+def validate_order_source(attrs: dict) -> None:
+    if ("order_tickets" in attrs) == ("auto_assign" in attrs):
+        raise serializers.ValidationError(
+            {"order_tickets": "Specify either order_tickets or auto_assign."}
+        )
+
+    if "auto_assign" in attrs and "hold_token" in attrs:
+        raise serializers.ValidationError(
+            {"hold_token": "Held seats are ordered with order_tickets."}
+        )
+
+
+class AutoAssignSerializer(serializers.Serializer):
+    flight = FlightField()
+    seats = serializers.IntegerField(
+        min_value=1,
+        help_text="Party size, seated next to each other in one row"
+    )
+    rows = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        help_text="Preferred rows, the nearest rows are used if they are full"
+    )
+
+    def validate(self, attrs):
+        airplane = attrs["flight"].airplane
+
+        if attrs["seats"] > airplane.seats_in_row:
+            raise serializers.ValidationError(
+                {"seats": f"A row has only {airplane.seats_in_row} seats."}
+            )
+
+        if any(row > airplane.rows for row in attrs.get("rows", [])):
+            raise serializers.ValidationError(
+                {"rows": f"Specify rows in range [1, {airplane.rows}]"}
+            )
+
+        return attrs
 
 
 class OrderSerializer(serializers.ModelSerializer):
     order_tickets = TicketSerializer(
         many=True,
         read_only=False,
+        required=False,
         allow_empty=False
     )
+    hold_token = serializers.UUIDField(
+        write_only=True,
+        required=False,
+        help_text="Token of the seat hold the tickets were held with"
+    )
+    auto_assign = AutoAssignSerializer(
+        write_only=True,
+        required=False,
+        help_text="Seats picked by the server instead of order_tickets"
+    )
 
     class Meta:
         model = Order
-        fields = ("id", "created_at", "order_tickets")
+        fields = (
+            "id", "created_at", "order_tickets", "hold_token", "auto_assign"
+        )
+
+    def validate(self, attrs):
+        validate_order_source(attrs)
+
+        return attrs
 
-    @transaction.atomic()
     def create(self, validated_data):
-        tickets_data = validated_data.pop("order_tickets")
-        order = Order.objects.create(**validated_data)
+        auto_assign = validated_data.pop("auto_assign", None)
+
+        if auto_assign is None:
+            tickets = [
+                Ticket(**ticket_data)
+                for ticket_data in validated_data.pop("order_tickets")
+            ]
+
+            return self.create_order(validated_data, tickets)
+
+        # The flight stays locked until its tickets are inserted
+        with transaction.atomic():
+            return assign_seats(
+                **auto_assign,
+                book=lambda tickets: self.create_order(
+                    validated_data, tickets
+                ),
+            )
+
+    def create_order(self, validated_data, tickets: list[Ticket]) -> Order:
+        hold_token = validated_data.pop("hold_token", None)
+
+        # Bounds were checked by TicketSerializer against the airplanes
+        # loaded with the flights, and seats by the seat inventory, so
+        # the tickets are inserted at once without full_clean().
+        with reserve_seats(tickets):
+            check_holds(tickets, validated_data["user"], hold_token)
+            order = Order.objects.create(**validated_data)
 
-        for ticket_data in tickets_data:
-            Ticket.objects.create(order=order, **ticket_data)
+            for ticket in tickets:
+                ticket.order = order
+
+            Ticket.objects.bulk_create(tickets)
+            count_created_tickets(tickets)
+
+            if hold_token is not None:
+                release_hold(hold_token)
 
         return order
 
 
 class OrderListSerializer(OrderSerializer):
     order_tickets = TicketListSerializer(many=True, read_only=True)
+
+
+class TicketIntakeSerializer(serializers.Serializer):
+    row = serializers.IntegerField(min_value=1)
+    seat = serializers.IntegerField(min_value=1)
+    flight = serializers.IntegerField(min_value=1)
+
+
+class AutoAssignIntakeSerializer(serializers.Serializer):
+    flight = serializers.IntegerField(min_value=1)
+    seats = serializers.IntegerField(min_value=1)
+    rows = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False
+    )
+
+
+class OrderIntakeSerializer(serializers.Serializer):
+    """Shape of an order accepted into the queue, checked without queries.
+
+    Flights, seat bounds and taken seats are validated by the worker.
+    """
+
+    order_tickets = TicketIntakeSerializer(
+        many=True, required=False, allow_empty=False
+    )
+    hold_token = serializers.UUIDField(required=False)
+    auto_assign = AutoAssignIntakeSerializer(required=False)
+
+    def validate(self, attrs):
+        validate_order_source(attrs)
+
+        return attrs
+
+
+class OrderRequestSerializer(serializers.ModelSerializer):
+    url = serializers.HyperlinkedIdentityField(
+        view_name="airport:order-request-detail"
+    )
+
+    class Meta:
+        model = OrderRequest
+        fields = ("id", "url", "status", "order", "errors", "created_at")
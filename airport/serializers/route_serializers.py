@@ -37,3 +37,46 @@ class RouteListSerializer(RouteSerializer):
 class RouteDetailSerializer(RouteSerializer):
     source = AirportSerializer()
     destination = AirportSerializer()
+
+
+class RouteDistanceMatrixQuerySerializer(serializers.Serializer):
+    ids = serializers.CharField(
+        help_text="Comma-separated list of airport ids"
+    )
+
+    MAX_IDS = 200
+
+    def validate_ids(self, value):
+        try:
+            ids = [int(airport_id) for airport_id in value.split(",")]
+        except ValueError:
+            raise serializers.ValidationError(
+                "Ids must be a comma-separated list of integers."
+            )
+
+        ids = list(dict.fromkeys(ids))
+
+        if len(ids) > self.MAX_IDS:
+            raise serializers.ValidationError(
+                f"Ensure there are no more than {self.MAX_IDS} ids."
+            )
+
+        return ids
+
+
+class RouteDistanceMatrixSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField())
+    distances = serializers.ListField(
+        child=serializers.ListField(child=serializers.FloatField())
+    )
+
+
+class RouteCalendarQuerySerializer(serializers.Serializer):
+    month = serializers.DateField(input_formats=["%Y-%m"])
+
+
+class RouteCalendarDaySerializer(serializers.Serializer):
+    date = serializers.DateField()
+    flights = serializers.IntegerField()
+    first_departure = serializers.DateTimeField()
+    seats_available = serializers.IntegerField()
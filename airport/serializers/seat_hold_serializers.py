@@ -0,0 +1,32 @@
+from rest_framework import serializers
+
+
+class SeatSerializer(serializers.Serializer):
+    row = serializers.IntegerField(min_value=1)
+    seat = serializers.IntegerField(min_value=1)
+
+
+class SeatHoldCreateSerializer(serializers.Serializer):
+    MAX_SEATS = 10
+
+    seats = SeatSerializer(many=True, allow_empty=False)
+    minutes = serializers.IntegerField(min_value=1, max_value=30, default=10)
+
+    def validate_seats(self, value):
+        seats = [(seat["row"], seat["seat"]) for seat in value]
+
+        if len(seats) > self.MAX_SEATS:
+            raise serializers.ValidationError(
+                f"Ensure there are no more than {self.MAX_SEATS} seats."
+            )
+
+        if len(set(seats)) != len(seats):
+            raise serializers.ValidationError("Seats must be unique.")
+
+        return seats
+
+
+class SeatHoldSerializer(serializers.Serializer):
+    token = serializers.UUIDField()
+    expires_at = serializers.DateTimeField()
+    seats = SeatSerializer(many=True)
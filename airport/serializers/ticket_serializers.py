@@ -2,12 +2,68 @@ from rest_framework import serializers
 
 from airport.models import Ticket, Flight
 from airport.serializers import FlightSerializer, FlightListSerializer
+from airport.services.seat_inventory import (
+    get_seat_inventory,
+    reserve_seats,
+)
+
+
+def parse_flight_id(value) -> int | None:
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+
+    return None
+
+
+class FlightField(serializers.PrimaryKeyRelatedField):
+    """Flight with its airplane, preloaded by `TicketBulkSerializer` if any."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault(
+            "queryset", Flight.objects.select_related("airplane")
+        )
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        # The field belongs to a TicketSerializer, maybe a list's child
+        flights = getattr(self.parent.parent, "loaded_flights", {})
+        flight = flights.get(parse_flight_id(data))
+
+        if flight is not None:
+            return flight
+
+        return super().to_internal_value(data)
+
+
+class TicketBulkSerializer(serializers.ListSerializer):
+    """Ticket list that loads all its flights in one query."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            flight_ids = {
+                parse_flight_id(item.get("flight"))
+                for item in data if isinstance(item, dict)
+            }
+            flight_ids.discard(None)
+            self.loaded_flights = (
+                Flight.objects.select_related("airplane").in_bulk(flight_ids)
+            )
+
+        return super().to_internal_value(data)
 
 
 class TicketSerializer(serializers.ModelSerializer):
+    flight = FlightField()
+
     class Meta:
         model = Ticket
         fields = ("id", "row", "seat", "flight")
+        list_serializer_class = TicketBulkSerializer
+        # Taken seats are checked by the seat inventory on save
+        validators = []
 
     def validate(self, attrs):
         row = attrs.get("row")
@@ -28,6 +84,32 @@ class TicketSerializer(serializers.ModelSerializer):
 
         return attrs
 
+    def create(self, validated_data):
+        ticket = Ticket(**validated_data)
+
+        with reserve_seats([ticket]):
+            ticket.save()
+
+        return ticket
+
+    def update(self, instance, validated_data):
+        previous = (instance.flight_id, instance.row, instance.seat)
+
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+
+        if previous == (instance.flight_id, instance.row, instance.seat):
+            instance.save()
+
+            return instance
+
+        with reserve_seats([instance]):
+            instance.save()
+
+        get_seat_inventory().release(previous[0], [previous[1:]])
+
+        return instance
+
 
 class TicketFlightSerializer(FlightSerializer):
     route = serializers.CharField(
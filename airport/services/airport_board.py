@@ -0,0 +1,56 @@
+import os
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from airport.models import Flight, Route
+from airport.serializers import FlightBoardSerializer
+
+
+AIRPORT_BOARD_TTL = int(os.getenv("AIRPORT_BOARD_TTL", 5))
+
+# Route end of the airport and flight time shown for each direction
+BOARD_FIELDS = {
+    "departures": ("source", "departure_time"),
+    "arrivals": ("destination", "arrival_time"),
+}
+
+
+def load_board(
+    airport_id: int, direction: str, hours: int, limit: int
+) -> list[dict]:
+    """Flights of an airport within the next `hours`, earliest first.
+
+    Routes of the airport are resolved in a subquery, so the flights
+    are read through the (route, time) indexes instead of a join on
+    airport columns.
+    """
+    route_end, time_field = BOARD_FIELDS[direction]
+    start = timezone.now()
+
+    flights = (
+        Flight.objects.filter(
+            route__in=Route.objects.filter(**{route_end: airport_id})
+            .values("id"),
+            **{
+                f"{time_field}__gte": start,
+                f"{time_field}__lt": start + timedelta(hours=hours),
+            },
+        )
+        .select_related("route__source", "route__destination", "airplane")
+        .order_by(time_field, "id")[:limit]
+    )
+
+    return FlightBoardSerializer(flights, many=True).data
+
+
+def get_board(
+    airport_id: int, direction: str, hours: int, limit: int
+) -> list[dict]:
+    """`load_board` cached for `AIRPORT_BOARD_TTL` seconds."""
+    return cache.get_or_set(
+        f"airport-board:{direction}:{airport_id}:{hours}:{limit}",
+        lambda: load_board(airport_id, direction, hours, limit),
+        AIRPORT_BOARD_TTL,
+    )
@@ -0,0 +1,112 @@
+import csv
+import io
+
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from airport.models import Airport
+from airport.pagination import drop_row_count
+from airport.serializers import AirportImportRowSerializer
+from airport.services.response_cache import bump_version_on_commit
+from airport.services.utils.distance_matrix import distance_matrix
+from airport.services.utils.spatial_index import airport_index
+
+
+MAX_IMPORT_ROWS = 10_000
+BATCH_SIZE = 500
+
+
+def read_csv(upload) -> list[dict]:
+    content = io.TextIOWrapper(upload, encoding="utf-8-sig")
+
+    try:
+        return list(csv.DictReader(content))
+    except UnicodeDecodeError:
+        raise serializers.ValidationError(
+            {"file": "The file must be encoded in UTF-8."}
+        )
+    except csv.Error as error:
+        raise serializers.ValidationError(
+            {"file": f"The file is not a valid CSV file: {error}."}
+        )
+
+
+def import_airports(rows: list[dict]) -> dict:
+    """Validate and insert airports in bulk.
+
+    Field and city checks are done in memory, duplicates against the
+    database are found with a single query, and every valid row is
+    inserted with `bulk_create`. Invalid rows are skipped and reported
+    by their 1-based position.
+    """
+    if len(rows) > MAX_IMPORT_ROWS:
+        raise serializers.ValidationError(
+            f"Ensure there are no more than {MAX_IMPORT_ROWS} rows."
+        )
+
+    errors = {}
+    candidates = {}
+
+    for number, row in enumerate(rows, start=1):
+        serializer = AirportImportRowSerializer(data=row)
+
+        if not serializer.is_valid():
+            errors[number] = serializer.errors
+            continue
+
+        airport = Airport(**serializer.validated_data)
+        key = (airport.name, airport.closest_big_city)
+
+        if not airport.set_coordinates():
+            errors[number] = {
+                "closest_big_city": ["The entered city does not exist."]
+            }
+        elif key in candidates:
+            errors[number] = {
+                "non_field_errors": ["Duplicate of an earlier row."]
+            }
+        else:
+            candidates[key] = (number, airport)
+
+    existing = set(
+        Airport.objects.filter(
+            name__in={name for name, _ in candidates},
+            closest_big_city__in={city for _, city in candidates},
+        ).values_list("name", "closest_big_city")
+    )
+
+    for key in existing & candidates.keys():
+        number, _ = candidates.pop(key)
+        errors[number] = {
+            "non_field_errors": [
+                "Airport with this name and city already exists."
+            ]
+        }
+
+    airports = [airport for _, airport in candidates.values()]
+
+    try:
+        with transaction.atomic():
+            Airport.objects.bulk_create(airports, batch_size=BATCH_SIZE)
+    except IntegrityError:
+        raise serializers.ValidationError(
+            "Airports were changed during the import, please retry."
+        )
+
+    # bulk_create skips model signals, so refresh the in-memory
+    # indexes and cached responses by hand.
+    airport_index.invalidate()
+    drop_row_count(Airport)
+    bump_version_on_commit(Airport)
+
+    if distance_matrix.is_loaded:
+        distance_matrix.sync(airports)
+
+    return {
+        "total": len(rows),
+        "created": len(airports),
+        "errors": [
+            {"row": number, "errors": errors[number]}
+            for number in sorted(errors)
+        ],
+    }
@@ -56,7 +56,14 @@ def add_airports(user_input: int) -> None:
             airport["closest_big_city"]) not in existing_airports
     ]
 
-    airport_objects = [Airport(**airport) for airport in unique_airports]
+    airport_objects = []
+
+    for airport_data in unique_airports:
+        airport = Airport(**airport_data)
+
+        if airport.set_coordinates():
+            airport_objects.append(airport)
+
     Airport.objects.bulk_create(airport_objects)
 
     print(f"Airports added successfully: {user_input}")
@@ -1,6 +1,7 @@
 import random
 
 from airport.models import Ticket, Order, Flight
+from airport.services.seat_counters import count_created_tickets
 
 
 def add_tickets(user_input: int) -> None:
@@ -39,5 +40,6 @@ def add_tickets(user_input: int) -> None:
         ticket_objects.append(ticket)
 
     Ticket.objects.bulk_create(ticket_objects)
+    count_created_tickets(ticket_objects)
 
     print(f"Tickets added successfully: {user_input}")
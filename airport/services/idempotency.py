@@ -0,0 +1,128 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from airport.models import IdempotencyKey
+
+
+MAX_KEY_LENGTH = 255
+
+
+def hash_request(request) -> str:
+    payload = json.dumps(
+        [request.method, request.path, request.data],
+        sort_keys=True,
+        default=str,
+    )
+
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def run_idempotent(request, key: str, handler) -> Response:
+    """Run `handler` once per user and key, replaying its response after.
+
+    Only successful responses are stored, for `IDEMPOTENCY_KEY_TTL`
+    seconds. A failed request releases the key, so it can be retried.
+    A retry that arrives while the first request is still running gets
+    409, and a key reused with a different payload gets 422. A running
+    request locks the key for `IDEMPOTENCY_LOCK_TIMEOUT` seconds; if it
+    dies without finishing, a retry after that takes the key over.
+    """
+    if len(key) > MAX_KEY_LENGTH:
+        return Response(
+            {"detail": f"Idempotency-Key is longer than {MAX_KEY_LENGTH}."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    now = timezone.now()
+    request_hash = hash_request(request)
+    locked_until = now + timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT)
+    records = IdempotencyKey.objects.filter(user=request.user, key=key)
+    records.filter(expires_at__lte=now).delete()
+
+    try:
+        with transaction.atomic():
+            IdempotencyKey.objects.create(
+                user=request.user,
+                key=key,
+                request_hash=request_hash,
+                locked_until=locked_until,
+                expires_at=now + timedelta(
+                    seconds=settings.IDEMPOTENCY_KEY_TTL
+                ),
+            )
+    except IntegrityError:
+        # Keys locked before the lease existed have no locked_until
+        taken_over = records.filter(
+            Q(locked_until__lte=now) | Q(locked_until__isnull=True),
+            request_hash=request_hash,
+            response_status=None,
+        ).update(locked_until=locked_until)
+
+        if not taken_over:
+            return replay(records.first(), request_hash)
+
+    # A request that outlived its lock was taken over and must not
+    # touch the key of the retry
+    owned = records.filter(locked_until=locked_until)
+
+    try:
+        response = handler()
+    except BaseException:
+        owned.delete()
+        raise
+
+    if status.is_success(response.status_code):
+        owned.update(
+            response_status=response.status_code,
+            response_body=response.data,
+        )
+    else:
+        owned.delete()
+
+    return response
+
+
+def replay(record: IdempotencyKey | None, request_hash: str) -> Response:
+    if record is not None and record.request_hash != request_hash:
+        return Response(
+            {"detail": "Idempotency-Key was used with another request."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+
+    if record is None or record.response_status is None:
+        return Response(
+            {"detail": "A request with this Idempotency-Key is running."},
+            status=status.HTTP_409_CONFLICT,
+        )
+
+    return Response(
+        record.response_body,
+        status=record.response_status,
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+def sweep_expired_keys(batch_size: int) -> int:
+    """Delete expired keys in batches of ids, returns their number."""
+    now = timezone.now()
+    deleted = 0
+
+    while True:
+        ids = list(
+            IdempotencyKey.objects.filter(expires_at__lte=now)
+            .order_by("expires_at")
+            .values_list("id", flat=True)[:batch_size]
+        )
+
+        if not ids:
+            return deleted
+
+        deleted += IdempotencyKey.objects.filter(id__in=ids).delete()[0]
@@ -0,0 +1,147 @@
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import serializers
+
+from airport.choices import OrderRequestStatus
+from airport.models import OrderRequest
+from airport.serializers import OrderSerializer
+
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_order(user, payload: dict) -> OrderRequest:
+    return OrderRequest.objects.create(user=user, payload=payload)
+
+
+def claim_requests(batch_size: int) -> list[OrderRequest]:
+    """Claim the oldest pending requests for a new worker id.
+
+    The claim is a single conditional UPDATE, so two workers never get
+    the same request. Requests left processing for longer than
+    `ORDER_QUEUE_CLAIM_TIMEOUT` seconds, by a worker that died, are
+    claimed again.
+    """
+    now = timezone.now()
+    worker = uuid.uuid4()
+    claimable = Q(status=OrderRequestStatus.PENDING) | Q(
+        status=OrderRequestStatus.PROCESSING,
+        claimed_at__lte=now - timedelta(
+            seconds=settings.ORDER_QUEUE_CLAIM_TIMEOUT
+        ),
+    )
+    ids = list(
+        OrderRequest.objects.filter(claimable)
+        .order_by("created_at")
+        .values_list("id", flat=True)[:batch_size]
+    )
+
+    if not ids:
+        return []
+
+    OrderRequest.objects.filter(claimable, id__in=ids).update(
+        status=OrderRequestStatus.PROCESSING, worker=worker, claimed_at=now
+    )
+
+    return list(
+        OrderRequest.objects.filter(
+            worker=worker, status=OrderRequestStatus.PROCESSING
+        )
+        .select_related("user")
+        .order_by("created_at")
+    )
+
+
+def finish_request(order_request: OrderRequest, **fields) -> None:
+    # A request claimed again after a timeout belongs to the new worker
+    OrderRequest.objects.filter(
+        id=order_request.id, worker=order_request.worker
+    ).update(**fields)
+
+
+def lock_claim(order_request: OrderRequest) -> bool:
+    """Lock a claimed request, whether it still belongs to its worker.
+
+    The lock is held until the transaction ends, so a worker that claims
+    the request again waits for the order to be written and then sees it
+    done.
+    """
+    return OrderRequest.objects.select_for_update().filter(
+        id=order_request.id,
+        worker=order_request.worker,
+        status=OrderRequestStatus.PROCESSING,
+    ).exists()
+
+
+def process_request(order_request: OrderRequest) -> None:
+    """Create the order of a request, or store why it was rejected.
+
+    A request claimed again by another worker in the meantime is left
+    to that worker.
+    """
+    serializer = OrderSerializer(data=order_request.payload)
+
+    try:
+        with transaction.atomic():
+            if not lock_claim(order_request):
+                return
+
+            serializer.is_valid(raise_exception=True)
+            order = serializer.save(user=order_request.user)
+            finish_request(
+                order_request, status=OrderRequestStatus.DONE, order=order
+            )
+    except serializers.ValidationError as error:
+        finish_request(
+            order_request,
+            status=OrderRequestStatus.FAILED,
+            errors=error.detail,
+        )
+    except Exception:
+        logger.exception("Order request %s failed", order_request.id)
+        finish_request(
+            order_request,
+            status=OrderRequestStatus.FAILED,
+            errors={"detail": "The order could not be processed."},
+        )
+
+
+def drain_queue(batch_size: int) -> int:
+    """Process requests until the queue is empty, returns their number."""
+    processed = 0
+
+    while order_requests := claim_requests(batch_size):
+        for order_request in order_requests:
+            process_request(order_request)
+
+        processed += len(order_requests)
+
+    return processed
+
+
+def _drain_in_thread(batch_size: int) -> int:
+    try:
+        return drain_queue(batch_size)
+    finally:
+        connection.close()
+
+
+def process_queue(workers: int, batch_size: int) -> int:
+    """Drain the queue with `workers` threads, returns processed requests.
+
+    Every thread claims its own batches, and every order is created in
+    its own transaction with a single insert of its tickets, so a seat
+    conflict fails only that order.
+    """
+    if workers == 1:
+        return drain_queue(batch_size)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(_drain_in_thread, [batch_size] * workers))
@@ -0,0 +1,65 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Model
+
+
+def get_response_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def version_key(model: type[Model]) -> str:
+    return f"response-version:{model._meta.label_lower}"
+
+
+def get_versions(models: tuple[type[Model], ...]) -> list[int]:
+    """Current response version of each model, in the given order."""
+    cache = get_response_cache()
+    keys = [version_key(model) for model in models]
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            # Start from the clock, so a version lost on eviction never
+            # comes back with a value that old entries were stored under
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+
+    return [versions[key] for key in keys]
+
+
+def bump_version(model: type[Model]) -> None:
+    """Make every cached response built from `model` unreachable."""
+    cache = get_response_cache()
+
+    try:
+        cache.incr(version_key(model))
+    except ValueError:
+        cache.add(version_key(model), time.time_ns(), timeout=None)
+
+
+def bump_version_on_commit(model: type[Model]) -> None:
+    """Bump the version of `model` once the current transaction commits.
+
+    Bumping earlier would let a concurrent request cache the data from
+    before the commit under the new version.
+    """
+    transaction.on_commit(lambda: bump_version(model))
+
+
+def response_cache_key(
+    prefix: str,
+    models: tuple[type[Model], ...],
+    query_params,
+) -> str:
+    query = urlencode(sorted(query_params.lists()), doseq=True)
+    versions = ".".join(str(version) for version in get_versions(models))
+    digest = hashlib.md5(
+        f"{query}|{versions}".encode(), usedforsecurity=False
+    ).hexdigest()
+
+    return f"response:{prefix}:{digest}"
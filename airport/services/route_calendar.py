@@ -0,0 +1,81 @@
+import os
+from datetime import date, datetime, time
+from typing import Iterable
+
+from django.core.cache import cache
+from django.db.models import Count, F, Min, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from airport.models import Flight
+
+
+ROUTE_CALENDAR_TTL = int(os.getenv("ROUTE_CALENDAR_TTL", 300))
+
+
+def calendar_cache_key(route_id: int, month: date) -> str:
+    return f"route-calendar:{route_id}:{month:%Y-%m}"
+
+
+def month_bounds(month: date) -> tuple[datetime, datetime]:
+    start = date(month.year, month.month, 1)
+    end = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+    return (
+        timezone.make_aware(datetime.combine(start, time.min)),
+        timezone.make_aware(datetime.combine(end, time.min)),
+    )
+
+
+def load_calendar(route_id: int, month: date) -> list[dict]:
+    """Flights of a route per day of a month, in one grouped query.
+
+    Available seats come from the `seats_sold` counter of each flight,
+    so tickets are not joined.
+    """
+    start, end = month_bounds(month)
+
+    return list(
+        Flight.objects.filter(
+            route_id=route_id,
+            departure_time__gte=start,
+            departure_time__lt=end,
+        )
+        .annotate(date=TruncDate("departure_time"))
+        .values("date")
+        .annotate(
+            flights=Count("id"),
+            first_departure=Min("departure_time"),
+            seats_available=Sum(
+                F("airplane__rows") * F("airplane__seats_in_row")
+                - F("seats_sold")
+            ),
+        )
+        .order_by("date")
+    )
+
+
+def get_calendar(route_id: int, month: date) -> list[dict]:
+    """`load_calendar` cached until a ticket of the month is sold."""
+    return cache.get_or_set(
+        calendar_cache_key(route_id, month),
+        lambda: load_calendar(route_id, month),
+        ROUTE_CALENDAR_TTL,
+    )
+
+
+def invalidate_calendars(flights: Iterable[tuple[int, datetime]]) -> None:
+    """Drop calendars of the given (route_id, departure_time) pairs."""
+    keys = set()
+
+    for route_id, departure_time in flights:
+        if timezone.is_naive(departure_time):
+            departure_time = timezone.make_aware(departure_time)
+
+        keys.add(
+            calendar_cache_key(
+                route_id, timezone.localtime(departure_time).date()
+            )
+        )
+
+    cache.delete_many(keys)
@@ -0,0 +1,96 @@
+from collections import defaultdict
+from typing import Callable
+
+from django.utils import timezone
+from rest_framework import serializers
+
+from airport.models import Flight, Order, SeatHold, Ticket
+from airport.services.seat_inventory import SeatsTaken
+from airport.services.utils.seat_bitset import best_block
+
+
+def taken_row_masks(flight: Flight) -> dict[int, int]:
+    """Sold and held seats of a flight as one bitmask per row.
+
+    Both are read in a single UNION query.
+    """
+    holds = SeatHold.objects.filter(
+        flight=flight, expires_at__gt=timezone.now()
+    )
+    seats = (
+        Ticket.objects.filter(flight=flight)
+        .order_by()
+        .values_list("row", "seat")
+        .union(holds.order_by().values_list("row", "seat"))
+    )
+    masks = defaultdict(int)
+
+    for row, seat in seats:
+        masks[row] |= 1 << (seat - 1)
+
+    return masks
+
+
+def row_order(rows: int, preferred: list[int]) -> list[int]:
+    """Preferred rows in their order, then the rest nearest first."""
+    if not preferred:
+        return list(range(1, rows + 1))
+
+    def distance(row: int) -> tuple[int, int, int]:
+        nearest = min(
+            range(len(preferred)),
+            key=lambda index: abs(row - preferred[index]),
+        )
+
+        return abs(row - preferred[nearest]), nearest, row
+
+    return sorted(range(1, rows + 1), key=distance)
+
+
+def assign_seats(
+    flight: Flight,
+    seats: int,
+    book: Callable[[list[Ticket]], Order],
+    rows: list[int] | None = None,
+) -> Order:
+    """Book `seats` free adjacent seats in one row of a flight.
+
+    `book` is called with unsaved tickets for the best free block and
+    its order is returned. The flight row is locked first, so concurrent
+    assignments on the same flight wait for each other; call it inside
+    a transaction and insert the tickets in `book`. Seats of explicit
+    orders and holds that are not committed yet cannot be read: when
+    the seat inventory, the unique constraint on tickets or a new hold
+    makes `book` raise `SeatsTaken`, those seats are marked taken and
+    the next best block is tried.
+    """
+    flight = (
+        Flight.objects.select_for_update(of=("self",))
+        .select_related("airplane")
+        .get(id=flight.id)
+    )
+    airplane = flight.airplane
+    masks = taken_row_masks(flight)
+
+    for row in row_order(airplane.rows, rows or []):
+        while (
+            start := best_block(masks[row], airplane.seats_in_row, seats)
+        ) is not None:
+            tickets = [
+                Ticket(flight=flight, row=row, seat=seat)
+                for seat in range(start, start + seats)
+            ]
+
+            try:
+                return book(tickets)
+            except SeatsTaken as error:
+                taken = error.seats.get(flight.id) or [
+                    (ticket.row, ticket.seat) for ticket in tickets
+                ]
+
+                for _, seat in taken:
+                    masks[row] |= 1 << (seat - 1)
+
+    raise serializers.ValidationError(
+        {"auto_assign": f"No {seats} adjacent free seats in one row."}
+    )
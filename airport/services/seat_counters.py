@@ -0,0 +1,67 @@
+from collections import Counter
+from typing import Iterable
+
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from airport.models import Flight, Ticket
+from airport.services.response_cache import bump_version_on_commit
+from airport.services.route_calendar import invalidate_calendars
+
+
+def adjust_seats_sold(deltas: dict[int, int]) -> None:
+    """Apply per-flight changes to `Flight.seats_sold` atomically."""
+    changed = [
+        flight_id for flight_id, delta in deltas.items()
+        if flight_id is not None and delta
+    ]
+
+    for flight_id in changed:
+        Flight.objects.filter(pk=flight_id).update(
+            seats_sold=F("seats_sold") + deltas[flight_id],
+            updated_at=timezone.now(),
+        )
+
+    if changed:
+        bump_version_on_commit(Flight)
+        invalidate_calendars(
+            Flight.objects.filter(pk__in=changed)
+            .values_list("route_id", "departure_time")
+        )
+
+
+def touch_flights(flight_ids: Iterable[int]) -> None:
+    """Mark flights as changed for changes that skip `Flight.save`."""
+    Flight.objects.filter(pk__in=flight_ids).update(updated_at=timezone.now())
+    bump_version_on_commit(Flight)
+
+
+def count_created_tickets(tickets: Iterable[Ticket]) -> None:
+    """Count tickets inserted with `bulk_create`, which sends no signals."""
+    adjust_seats_sold(Counter(ticket.flight_id for ticket in tickets))
+
+
+def reconcile_seats_sold() -> int:
+    """Reset every drifted counter to the real number of tickets."""
+    tickets_count = Coalesce(
+        Subquery(
+            Ticket.objects.filter(flight=OuterRef("pk"))
+            .order_by()
+            .values("flight")
+            .annotate(count=Count("id"))
+            .values("count")
+        ),
+        0,
+    )
+
+    updated = (
+        Flight.objects.annotate(tickets_count=tickets_count)
+        .exclude(seats_sold=F("tickets_count"))
+        .update(seats_sold=tickets_count, updated_at=timezone.now())
+    )
+
+    if updated:
+        bump_version_on_commit(Flight)
+
+    return updated
@@ -0,0 +1,145 @@
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import serializers
+
+from airport.models import Flight, SeatHold, Ticket
+from airport.services.seat_inventory import SeatsTaken
+
+
+def seats_q(seats: Iterable[tuple[int, int, int]]) -> Q:
+    """Match any of the given (flight_id, row, seat) triples."""
+    query = Q(pk__in=[])
+
+    for flight_id, row, seat in seats:
+        query |= Q(flight_id=flight_id, row=row, seat=seat)
+
+    return query
+
+
+def create_hold(
+    flight: Flight,
+    seats: list[tuple[int, int]],
+    user,
+    minutes: int,
+) -> tuple[uuid.UUID, datetime]:
+    """Hold free seats of a flight for `minutes`, all of them or none.
+
+    Sold and held seats are looked up in one query each, and every
+    conflicting seat is reported at once. The unique constraint on
+    holds settles a race between two holds of the same seat.
+    """
+    now = timezone.now()
+    requested = seats_q((flight.id, row, seat) for row, seat in seats)
+    sold = set(
+        Ticket.objects.filter(requested).values_list("row", "seat")
+    )
+    held = set(
+        SeatHold.objects.filter(requested, expires_at__gt=now)
+        .values_list("row", "seat")
+    )
+
+    if sold or held:
+        raise serializers.ValidationError([
+            f"Row {row} seat {seat} is already "
+            f"{'sold' if (row, seat) in sold else 'held'}."
+            for row, seat in seats
+            if (row, seat) in sold or (row, seat) in held
+        ])
+
+    token = uuid.uuid4()
+    expires_at = now + timedelta(minutes=minutes)
+
+    try:
+        with transaction.atomic():
+            # Expired holds are swept in the background, but they must
+            # not block a seat in the meantime
+            SeatHold.objects.filter(requested, expires_at__lte=now).delete()
+            SeatHold.objects.bulk_create(
+                SeatHold(
+                    flight=flight,
+                    row=row,
+                    seat=seat,
+                    token=token,
+                    user=user,
+                    expires_at=expires_at,
+                )
+                for row, seat in seats
+            )
+    except IntegrityError:
+        raise serializers.ValidationError(
+            "Seats were held by another customer, please retry."
+        )
+
+    return token, expires_at
+
+
+class SeatsHeld(SeatsTaken):
+    """Seats of new tickets are held by other customers."""
+
+    message = (
+        "Row {row} seat {seat} on flight {flight_id} is held "
+        "by another customer."
+    )
+
+
+def check_holds(tickets: list[Ticket], user, token: uuid.UUID | None) -> None:
+    """Reject tickets for seats held by someone else.
+
+    Seats held by `user` are allowed, under any of their holds. With a
+    token, that hold must still be active and belong to `user`. Call it
+    inside the transaction that inserts the tickets: the holds read are
+    locked until it ends, so they cannot be released or swept before
+    the tickets exist.
+    """
+    now = timezone.now()
+    holds = SeatHold.objects.select_for_update()
+
+    if token is not None and not holds.filter(
+        token=token, user=user, expires_at__gt=now
+    ).exists():
+        raise serializers.ValidationError(
+            {"hold_token": "The hold has expired or does not exist."}
+        )
+
+    held = holds.filter(
+        seats_q(
+            (ticket.flight_id, ticket.row, ticket.seat) for ticket in tickets
+        ),
+        expires_at__gt=now,
+    ).exclude(user=user)
+
+    conflicts = defaultdict(list)
+
+    for flight_id, row, seat in held.values_list("flight_id", "row", "seat"):
+        conflicts[flight_id].append((row, seat))
+
+    if conflicts:
+        raise SeatsHeld(conflicts)
+
+
+def release_hold(token: uuid.UUID) -> None:
+    SeatHold.objects.filter(token=token).delete()
+
+
+def sweep_expired_holds(batch_size: int) -> int:
+    """Delete expired holds in batches of ids, returns their number."""
+    now = timezone.now()
+    deleted = 0
+
+    while True:
+        ids = list(
+            SeatHold.objects.filter(expires_at__lte=now)
+            .order_by("expires_at")
+            .values_list("id", flat=True)[:batch_size]
+        )
+
+        if not ids:
+            return deleted
+
+        deleted += SeatHold.objects.filter(id__in=ids).delete()[0]
@@ -0,0 +1,349 @@
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterable
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, connection, transaction
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+
+from airport.models import Flight, Ticket
+from airport.services.utils.seat_bitset import seat_index
+
+
+Seat = tuple[int, int]
+
+
+class SeatInventory(ABC):
+    """Taken seats of each flight, consulted before touching the database.
+
+    `reserve` takes all the requested seats or none of them and returns
+    the conflicting ones. Reserved seats stay taken until they are sold
+    or released. Sold seats may be stale in both directions (sold or
+    refunded by another process), so a conflict is double-checked
+    against the database, and a seat that looked free is still
+    protected by the unique constraint on tickets. Booking a free seat,
+    the common case, needs no query at all.
+    """
+
+    def reserve(self, flight: Flight, seats: list[Seat]) -> list[Seat]:
+        conflicts = self._take(flight, seats)
+
+        if conflicts:
+            self.refresh(flight, seats)
+            conflicts = self._take(flight, seats)
+
+        return conflicts
+
+    @abstractmethod
+    def sell(self, flight_id: int, seats: Iterable[Seat]) -> None:
+        """Mark reserved seats of a flight sold once tickets hold them."""
+
+    @abstractmethod
+    def release(self, flight_id: int, seats: Iterable[Seat]) -> None:
+        """Give seats of a flight back."""
+
+    @abstractmethod
+    def refresh(self, flight: Flight, seats: list[Seat]) -> None:
+        """Align the sold seats among the given ones with the database.
+
+        Seats reserved by running requests are kept.
+        """
+
+    @abstractmethod
+    def _take(self, flight: Flight, seats: list[Seat]) -> list[Seat]:
+        """Take all the seats or none, returns the conflicting ones."""
+
+    @staticmethod
+    def sold_seats(flight_id: int) -> list[Seat]:
+        """Seats of a flight sold in the database."""
+        return list(
+            Ticket.objects.filter(flight_id=flight_id)
+            .values_list("row", "seat")
+        )
+
+
+class LocalSeatInventory(SeatInventory):
+    """Per-process bitsets, for single-node setups.
+
+    The entry of a flight is `[seats_in_row, sold, reserved]`, with one
+    int for the sold seats and one for the reserved ones.
+    """
+
+    def __init__(self) -> None:
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def _mask(self, seats: Iterable[Seat], seats_in_row: int) -> int:
+        mask = 0
+
+        for row, seat in seats:
+            mask |= 1 << seat_index(row, seat, seats_in_row)
+
+        return mask
+
+    def _entry(self, flight: Flight) -> list[int]:
+        entry = self._flights.get(flight.id)
+
+        if entry is None:
+            seats_in_row = flight.airplane.seats_in_row
+            mask = self._mask(self.sold_seats(flight.id), seats_in_row)
+            entry = self._flights.setdefault(
+                flight.id, [seats_in_row, mask, 0]
+            )
+
+        return entry
+
+    def _take(self, flight: Flight, seats: list[Seat]) -> list[Seat]:
+        entry = self._entry(flight)
+
+        with self._lock:
+            seats_in_row, sold, reserved = entry
+            taken = sold | reserved
+
+            if taken & self._mask(seats, seats_in_row):
+                return [
+                    seat for seat in seats
+                    if taken & self._mask([seat], seats_in_row)
+                ]
+
+            entry[2] = reserved | self._mask(seats, seats_in_row)
+
+        return []
+
+    def sell(self, flight_id: int, seats: Iterable[Seat]) -> None:
+        with self._lock:
+            entry = self._flights.get(flight_id)
+
+            if entry is not None:
+                mask = self._mask(seats, entry[0])
+                entry[1] |= mask
+                entry[2] &= ~mask
+
+    def release(self, flight_id: int, seats: Iterable[Seat]) -> None:
+        with self._lock:
+            entry = self._flights.get(flight_id)
+
+            if entry is not None:
+                mask = self._mask(seats, entry[0])
+                entry[1] &= ~mask
+                entry[2] &= ~mask
+
+    def refresh(self, flight: Flight, seats: list[Seat]) -> None:
+        sold = self.sold_seats(flight.id)
+
+        with self._lock:
+            entry = self._flights.get(flight.id)
+
+            if entry is not None:
+                entry[1] = self._mask(sold, entry[0])
+
+
+class CacheSeatInventory(SeatInventory):
+    """Seats shared between processes through a Django cache.
+
+    Every taken seat is a key created with `cache.add`, which is atomic
+    on Redis, Memcached and the local-memory backend. Its value tells
+    sold seats from reserved ones. The sold seats of a flight are loaded
+    on first use; keys expire after `SEAT_INVENTORY_TIMEOUT` and are
+    loaded again. Reserved seats expire after `SEAT_RESERVATION_TIMEOUT`,
+    so a process that died mid-request does not keep them.
+    """
+
+    SOLD = "sold"
+    RESERVED = "reserved"
+
+    def __init__(self) -> None:
+        self.cache = caches[settings.SEAT_INVENTORY_CACHE_ALIAS]
+        self.timeout = settings.SEAT_INVENTORY_TIMEOUT
+        self.reservation_timeout = settings.SEAT_RESERVATION_TIMEOUT
+
+    @staticmethod
+    def _key(flight_id: int, seat: Seat) -> str:
+        return f"seat:{flight_id}:{seat[0]}:{seat[1]}"
+
+    def _take(self, flight: Flight, seats: list[Seat]) -> list[Seat]:
+        if self.cache.add(f"seats-loaded:{flight.id}", 1, self.timeout):
+            self.cache.set_many(
+                {
+                    self._key(flight.id, seat): self.SOLD
+                    for seat in self.sold_seats(flight.id)
+                },
+                self.timeout,
+            )
+
+        for index, seat in enumerate(seats):
+            if not self.cache.add(
+                self._key(flight.id, seat),
+                self.RESERVED,
+                self.reservation_timeout,
+            ):
+                self.release(flight.id, seats[:index])
+
+                # The failed seat is reported even if its key is gone by
+                # now, the rest only if they are still taken
+                return [seat] + [
+                    other for other in seats[index + 1:]
+                    if self.cache.get(self._key(flight.id, other))
+                ]
+
+        return []
+
+    def sell(self, flight_id: int, seats: Iterable[Seat]) -> None:
+        self.cache.set_many(
+            {self._key(flight_id, seat): self.SOLD for seat in seats},
+            self.timeout,
+        )
+
+    def release(self, flight_id: int, seats: Iterable[Seat]) -> None:
+        self.cache.delete_many([self._key(flight_id, seat) for seat in seats])
+
+    def refresh(self, flight: Flight, seats: list[Seat]) -> None:
+        sold = set(self.sold_seats(flight.id)).intersection(seats)
+        self.sell(flight.id, sold)
+
+        # Seats refunded since they were sold; reserved ones are kept
+        refunded = self.cache.get_many(
+            [self._key(flight.id, seat) for seat in set(seats) - sold]
+        )
+        self.cache.delete_many(
+            [key for key, value in refunded.items() if value == self.SOLD]
+        )
+
+
+@lru_cache(maxsize=1)
+def get_seat_inventory() -> SeatInventory:
+    return import_string(settings.SEAT_INVENTORY_BACKEND)()
+
+
+SEAT_COLUMNS = frozenset(("flight_id", "row", "seat"))
+
+
+@lru_cache(maxsize=1)
+def seat_constraint_names() -> frozenset[str]:
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, Ticket._meta.db_table
+        )
+
+    return frozenset(
+        name for name, constraint in constraints.items()
+        if constraint["unique"] and set(constraint["columns"]) == SEAT_COLUMNS
+    )
+
+
+def is_seat_conflict(error: IntegrityError) -> bool:
+    """Whether `error` violates the unique seat constraint of tickets."""
+    diag = getattr(error.__cause__, "diag", None)
+
+    if diag is not None and diag.constraint_name:
+        return diag.constraint_name in seat_constraint_names()
+
+    # SQLite names the columns of the violated constraint instead
+    message = str(error)
+
+    return message.startswith("UNIQUE constraint failed") and all(
+        f"{Ticket._meta.db_table}.{column}" in message
+        for column in SEAT_COLUMNS
+    )
+
+
+class SeatsTaken(serializers.ValidationError):
+    """Seats of new tickets are taken, `seats` maps flight ids to them.
+
+    `seats` is empty when the database rejected the tickets but the
+    conflicting seats were released again before they could be read.
+    """
+
+    message = "Row {row} seat {seat} on flight {flight_id} is already taken."
+
+    def __init__(self, seats: dict[int, list[Seat]]) -> None:
+        self.seats = seats
+        super().__init__(
+            [
+                self.message.format(row=row, seat=seat, flight_id=flight_id)
+                for flight_id, taken in seats.items()
+                for row, seat in taken
+            ]
+            or "Seats were taken by another order, please retry."
+        )
+
+
+@contextmanager
+def reserve_seats(tickets: Iterable[Ticket]):
+    """Reserve the seats of new tickets for the duration of the block.
+
+    A seat listed twice is rejected with a validation error, and every
+    conflicting seat of every flight is reported in one `SeatsTaken`
+    error. The block runs in a transaction. If it succeeds
+    the seats are marked sold, if it fails they are given back, and a
+    violation of the unique seat constraint is reported as a validation
+    error.
+    """
+    inventory = get_seat_inventory()
+    requested = defaultdict(list)
+    flights = {}
+
+    for ticket in tickets:
+        requested[ticket.flight_id].append((ticket.row, ticket.seat))
+        flights[ticket.flight_id] = ticket.flight
+
+    repeated = [
+        f"Row {row} seat {seat} on flight {flight_id} is listed twice."
+        for flight_id, seats in requested.items()
+        for row, seat in sorted(set(seats))
+        if seats.count((row, seat)) > 1
+    ]
+
+    if repeated:
+        raise serializers.ValidationError(repeated)
+
+    reserved = []
+    conflicts = {}
+
+    try:
+        for flight_id, seats in requested.items():
+            taken = inventory.reserve(flights[flight_id], seats)
+
+            if taken:
+                conflicts[flight_id] = taken
+            else:
+                reserved.append(flight_id)
+
+        if conflicts:
+            raise SeatsTaken(conflicts)
+
+        with transaction.atomic():
+            yield
+    except IntegrityError as error:
+        if not is_seat_conflict(error):
+            for flight_id in reserved:
+                inventory.release(flight_id, requested[flight_id])
+
+            raise
+
+        # The inventory missed seats sold elsewhere: resync it and
+        # report what the database holds
+        for flight_id in reserved:
+            seats = requested[flight_id]
+            inventory.release(flight_id, seats)
+            inventory.refresh(flights[flight_id], seats)
+            sold = set(inventory.sold_seats(flight_id))
+            taken = [seat for seat in seats if seat in sold]
+
+            if taken:
+                conflicts[flight_id] = taken
+
+        raise SeatsTaken(conflicts)
+    except BaseException:
+        for flight_id in reserved:
+            inventory.release(flight_id, requested[flight_id])
+
+        raise
+    else:
+        for flight_id in reserved:
+            inventory.sell(flight_id, requested[flight_id])
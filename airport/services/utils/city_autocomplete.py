@@ -0,0 +1,109 @@
+import bisect
+import csv
+import difflib
+import heapq
+import unicodedata
+from functools import lru_cache
+
+from airport.services.utils.gazetteer import DATA_CITIES_PATH, normalize_city
+from airport.services.utils.lru_cache import LRUCache
+
+
+def fold_name(name: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", normalize_city(name))
+
+    return "".join(char for char in decomposed
+                   if not unicodedata.combining(char)).casefold()
+
+
+class CityAutocomplete:
+    """Sorted-array prefix index over every spelling of every city.
+
+    Both the local (`city`) and ascii (`city_ascii`) names are indexed,
+    folded to lowercase without accents, so "sao", "São" and "SAO" all
+    reach São Paulo. Matches are ranked by population.
+    """
+
+    def __init__(self, path: str, cache_size: int = 4096) -> None:
+        self.cities = []
+        spellings = set()
+
+        with open(path, "r", encoding="utf-8") as file:
+            reader = csv.DictReader(file)
+
+            for row in reader:
+                city_id = len(self.cities)
+                self.cities.append({
+                    "name": row["city_ascii"],
+                    "local_name": row["city"],
+                    "country": row["country"],
+                    "population": int(float(row["population"] or 0)),
+                    "lat": float(row["lat"]),
+                    "lng": float(row["lng"]),
+                })
+
+                for name in (row["city"], row["city_ascii"]):
+                    spellings.add((fold_name(name), city_id))
+
+        spellings = sorted(spellings)
+        self._keys = [key for key, _ in spellings]
+        self._ids = [city_id for _, city_id in spellings]
+        self._cache = LRUCache(maxsize=cache_size)
+
+    def _prefix_range(self, prefix: str) -> tuple[int, int]:
+        start = bisect.bisect_left(self._keys, prefix)
+        end = bisect.bisect_left(self._keys, prefix + "\uffff", lo=start)
+
+        return start, end
+
+    def _by_population(self, city_ids, limit: int) -> list[int]:
+        return heapq.nlargest(
+            limit,
+            set(city_ids),
+            key=lambda city_id: self.cities[city_id]["population"],
+        )
+
+    def _fuzzy(self, prefix: str, limit: int) -> list[int]:
+        # Typos rarely hit the first letter, so only compare spellings
+        # sharing it instead of the whole index.
+        start, end = self._prefix_range(prefix[0])
+        candidates = {}
+
+        for key, city_id in zip(self._keys[start:end], self._ids[start:end]):
+            candidates.setdefault(key[:len(prefix)], []).append(city_id)
+
+        matches = difflib.get_close_matches(
+            prefix, candidates, n=limit, cutoff=0.75
+        )
+
+        return self._by_population(
+            (city_id for key in matches for city_id in candidates[key]),
+            limit,
+        )
+
+    def _search(self, query: tuple[str, int]) -> list[int]:
+        prefix, limit = query
+        start, end = self._prefix_range(prefix)
+
+        if start < end:
+            return self._by_population(self._ids[start:end], limit)
+
+        return self._fuzzy(prefix, limit)
+
+    def search(self, query: str, limit: int = 10) -> list[dict]:
+        prefix = fold_name(query)
+
+        if not prefix:
+            return []
+
+        city_ids = self._cache.get_or_load((prefix, limit), self._search)
+
+        return [self.cities[city_id] for city_id in city_ids]
+
+
+@lru_cache(maxsize=1)
+def get_city_autocomplete() -> CityAutocomplete:
+    if not DATA_CITIES_PATH:
+        raise FileNotFoundError("The required file was not found.")
+
+    return CityAutocomplete(DATA_CITIES_PATH)
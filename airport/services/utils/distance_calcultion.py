@@ -1,40 +1,35 @@
-import csv
 import math
 import os
 
+import numpy as np
 
-DATA_CITIES_PATH = os.environ.get("DATA_CITIES_PATH")
+from airport.services.utils.gazetteer import find_city, normalize_city
+from airport.services.utils.lru_cache import LRUCache
 
-city_cache = {}
 
+EARTH_RADIUS = 6371
 
-def get_coord(city: str) -> dict:
-    if city in city_cache:
-        return city_cache.get(city)
+CITY_CACHE_SIZE = int(os.environ.get("CITY_CACHE_SIZE", 1024))
+
+city_cache = LRUCache(maxsize=CITY_CACHE_SIZE)
 
-    if not DATA_CITIES_PATH:
-        raise FileNotFoundError("The required file was not found.")
 
-    with open(DATA_CITIES_PATH, "r", encoding="utf-8") as file:
-        reader = csv.DictReader(file)
+def lookup_city(city: str) -> dict | None:
+    return city_cache.get_or_load(normalize_city(city), find_city)
 
-        for row in reader:
-            if row["city_ascii"] == city:
-                city_coords = {
-                    "lat": float(row["lat"]),
-                    "lng": float(row["lng"]),
-                }
-                city_cache[city] = city_coords
 
-                return city_coords
+def get_coord(city: str) -> dict:
+    city_coords = lookup_city(city)
+
+    if city_coords is None:
+        raise ValueError("There is no data for the city you specified.")
 
-    raise ValueError("There is no data for the city you specified.")
+    return city_coords
 
 
 def calculate_distance(source_coords: dict, destination_coords: dict) -> float:
     lat_1, lng_1 = source_coords["lat"], source_coords["lng"]
     lat_2, lng_2 = destination_coords["lat"], destination_coords["lng"]
-    earth_radius = 6371
 
     lat_1, lng_1, lat_2, lng_2 = map(
         math.radians, [lat_1, lng_1, lat_2, lng_2]
@@ -51,4 +46,32 @@ def calculate_distance(source_coords: dict, destination_coords: dict) -> float:
         math.sqrt(intermediate_distance), math.sqrt(1 - intermediate_distance)
     )
 
-    return earth_radius * central_angle
+    return EARTH_RADIUS * central_angle
+
+
+def calculate_distances(
+        source_lat: np.ndarray,
+        source_lng: np.ndarray,
+        destination_lat: np.ndarray,
+        destination_lng: np.ndarray,
+) -> np.ndarray:
+    """Vectorized `calculate_distance` over arrays of coordinates."""
+    lat_1, lng_1, lat_2, lng_2 = (
+        np.radians(np.asarray(values, dtype=np.float64))
+        for values in (
+            source_lat, source_lng, destination_lat, destination_lng
+        )
+    )
+
+    delta_lat = lat_2 - lat_1
+    delta_lng = lng_2 - lng_1
+
+    intermediate_distance = (
+        np.sin(delta_lat / 2) ** 2
+        + np.cos(lat_1) * np.cos(lat_2) * np.sin(delta_lng / 2) ** 2
+    )
+    central_angle = 2 * np.arctan2(
+        np.sqrt(intermediate_distance), np.sqrt(1 - intermediate_distance)
+    )
+
+    return EARTH_RADIUS * central_angle
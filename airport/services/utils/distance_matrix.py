@@ -0,0 +1,169 @@
+import threading
+
+import numpy as np
+
+from airport.services.utils.distance_calcultion import calculate_distances
+
+
+# Rows computed per vectorized pass by `load`, which bounds its float64
+# temporaries to LOAD_CHUNK x n instead of n x n
+LOAD_CHUNK = 256
+
+
+class DistanceMatrix:
+    """Great-circle distances between every pair of airports, in km.
+
+    Distances live in a square float32 array indexed through a map of
+    airport ids. Adding an airport computes a single row in one
+    vectorized pass; the array grows by doubling, so a run of inserts
+    costs amortized O(n) each.
+
+    float32 keeps about 7 significant digits, so a distance read from
+    the matrix can be off by up to a few metres. That is fine for the
+    distance-matrix endpoint, but `Route.distance` is computed from
+    the two airports in float64 and never read from here. The matrix
+    is only loaded by the processes that serve that endpoint.
+    """
+
+    def __init__(self) -> None:
+        self._index = {}
+        self._ids = np.empty(0, dtype=np.int64)
+        self._lat = np.empty(0, dtype=np.float64)
+        self._lng = np.empty(0, dtype=np.float64)
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+        self._size = 0
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, airport_id: int) -> bool:
+        return airport_id in self._index
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    def _grow(self, capacity: int) -> None:
+        size = self._size
+
+        for name in ("_ids", "_lat", "_lng"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:size] = old[:size]
+            setattr(self, name, new)
+
+        matrix = np.empty((capacity, capacity), dtype=np.float32)
+        matrix[:size, :size] = self._matrix[:size, :size]
+        self._matrix = matrix
+
+    def _set_row(self, position: int) -> None:
+        size = self._size
+        row = calculate_distances(
+            self._lat[position],
+            self._lng[position],
+            self._lat[:size],
+            self._lng[:size],
+        )
+        self._matrix[position, :size] = row
+        self._matrix[:size, position] = row
+
+    def load(self) -> None:
+        from airport.models import Airport
+
+        rows = list(
+            Airport.objects.filter(
+                latitude__isnull=False,
+                longitude__isnull=False,
+            ).values_list("id", "latitude", "longitude")
+        )
+
+        with self._lock:
+            self._size = 0
+            self._index = {}
+            self._grow(len(rows))
+
+            if rows:
+                ids, lat, lng = map(np.array, zip(*rows))
+                self._ids[:], self._lat[:], self._lng[:] = ids, lat, lng
+
+                for start in range(0, len(rows), LOAD_CHUNK):
+                    end = start + LOAD_CHUNK
+                    self._matrix[start:end] = calculate_distances(
+                        lat[start:end, np.newaxis],
+                        lng[start:end, np.newaxis],
+                        lat[np.newaxis, :],
+                        lng[np.newaxis, :],
+                    )
+
+                self._index = {
+                    airport_id: position
+                    for position, airport_id in enumerate(ids.tolist())
+                }
+                self._size = len(rows)
+
+            self._loaded = True
+
+    def ensure_loaded(self) -> None:
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self.load()
+
+    def add(self, airport_id: int, lat: float, lng: float) -> None:
+        with self._lock:
+            position = self._index.get(airport_id)
+
+            if position is None:
+                if self._size == len(self._ids):
+                    self._grow(max(16, 2 * self._size))
+
+                position = self._size
+                self._index[airport_id] = position
+                self._ids[position] = airport_id
+                self._size += 1
+            elif (self._lat[position], self._lng[position]) == (lat, lng):
+                return
+
+            self._lat[position], self._lng[position] = lat, lng
+            self._set_row(position)
+
+    def remove(self, airport_id: int) -> None:
+        with self._lock:
+            position = self._index.pop(airport_id, None)
+
+            if position is None:
+                return
+
+            last = self._size - 1
+
+            if position != last:
+                # Move the last airport into the freed slot
+                last_id = int(self._ids[last])
+                self._index[last_id] = position
+                self._ids[position] = last_id
+                self._lat[position] = self._lat[last]
+                self._lng[position] = self._lng[last]
+                self._matrix[position, :last] = self._matrix[last, :last]
+                self._matrix[:last, position] = self._matrix[:last, last]
+                self._matrix[position, position] = 0
+
+            self._size = last
+
+    def sync(self, airports) -> None:
+        """Add or refresh airports whose coordinates the matrix lacks."""
+        self.ensure_loaded()
+
+        for airport in airports:
+            if airport.has_coordinates:
+                self.add(airport.id, airport.latitude, airport.longitude)
+
+    def get_submatrix(self, airport_ids: list[int]) -> np.ndarray:
+        with self._lock:
+            positions = [self._index[airport_id] for airport_id in airport_ids]
+
+            return self._matrix[np.ix_(positions, positions)].copy()
+
+
+distance_matrix = DistanceMatrix()
@@ -0,0 +1,169 @@
+import csv
+import mmap
+import os
+import struct
+from functools import lru_cache
+
+
+DATA_CITIES_PATH = os.environ.get("DATA_CITIES_PATH")
+DATA_CITIES_COMPILED_PATH = os.environ.get(
+    "DATA_CITIES_COMPILED_PATH",
+    f"{DATA_CITIES_PATH}.bin" if DATA_CITIES_PATH else None,
+)
+
+# Compiled file layout (little-endian):
+#   header:   magic, number of cities, size of the names blob
+#   offsets:  uint32[count + 1], start of every name inside the blob
+#   lat, lng: float32[count] each
+#   names:    normalized utf-8 names, sorted bytewise
+MAGIC = b"ACITY\x00\x00\x01"
+HEADER = struct.Struct("<8sII")
+OFFSET = struct.Struct("<I")
+COORD = struct.Struct("<f")
+
+
+def normalize_city(city: str) -> str:
+    return city.strip().lower()
+
+
+def read_cities(path: str) -> dict[str, dict]:
+    """Read the cities file into a name -> coords map.
+
+    The file is sorted by population, so for ambiguous names the
+    biggest city wins, the same as the old first-match scan.
+    """
+    cities = {}
+
+    with open(path, "r", encoding="utf-8") as file:
+        reader = csv.DictReader(file)
+
+        for row in reader:
+            cities.setdefault(
+                normalize_city(row["city_ascii"]),
+                {
+                    "lat": float(row["lat"]),
+                    "lng": float(row["lng"]),
+                },
+            )
+
+    return cities
+
+
+def compile_cities(source: str, destination: str) -> int:
+    cities = read_cities(source)
+    names = sorted(name.encode("utf-8") for name in cities)
+
+    offsets = [0]
+    for name in names:
+        offsets.append(offsets[-1] + len(name))
+
+    blob = b"".join(names)
+    coords = [cities[name.decode("utf-8")] for name in names]
+
+    # Write next to the target and swap it in, so workers that already
+    # mapped the old file keep reading a consistent copy.
+    tmp_path = f"{destination}.tmp"
+
+    with open(tmp_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, len(names), len(blob)))
+        file.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        file.write(
+            struct.pack(f"<{len(coords)}f", *(c["lat"] for c in coords))
+        )
+        file.write(
+            struct.pack(f"<{len(coords)}f", *(c["lng"] for c in coords))
+        )
+        file.write(blob)
+
+    os.replace(tmp_path, destination)
+
+    return len(names)
+
+
+class CsvGazetteer:
+    def __init__(self, path: str) -> None:
+        self._cities = read_cities(path)
+
+    def find(self, city: str) -> dict | None:
+        return self._cities.get(normalize_city(city))
+
+
+class CompiledGazetteer:
+    """Binary search over a memory-mapped file built by `compile_cities`.
+
+    The pages are shared through the OS page cache, so every worker
+    process reads the same copy instead of holding its own dict.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as file:
+            self._buffer = mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+
+        magic, self._count, _ = HEADER.unpack_from(self._buffer, 0)
+
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a compiled cities file.")
+
+        self._offsets_start = HEADER.size
+        self._lat_start = self._offsets_start + OFFSET.size * (
+            self._count + 1
+        )
+        self._lng_start = self._lat_start + COORD.size * self._count
+        self._names_start = self._lng_start + COORD.size * self._count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _offset(self, index: int) -> int:
+        return OFFSET.unpack_from(
+            self._buffer, self._offsets_start + OFFSET.size * index
+        )[0]
+
+    def _name(self, index: int) -> bytes:
+        start = self._names_start + self._offset(index)
+        end = self._names_start + self._offset(index + 1)
+
+        return self._buffer[start:end]
+
+    def find(self, city: str) -> dict | None:
+        key = normalize_city(city).encode("utf-8")
+        low, high = 0, self._count
+
+        while low < high:
+            middle = (low + high) // 2
+
+            if self._name(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low == self._count or self._name(low) != key:
+            return None
+
+        return {
+            "lat": COORD.unpack_from(
+                self._buffer, self._lat_start + COORD.size * low
+            )[0],
+            "lng": COORD.unpack_from(
+                self._buffer, self._lng_start + COORD.size * low
+            )[0],
+        }
+
+
+@lru_cache(maxsize=1)
+def get_gazetteer() -> CsvGazetteer | CompiledGazetteer:
+    if DATA_CITIES_COMPILED_PATH and os.path.exists(
+        DATA_CITIES_COMPILED_PATH
+    ):
+        return CompiledGazetteer(DATA_CITIES_COMPILED_PATH)
+
+    if not DATA_CITIES_PATH:
+        raise FileNotFoundError("The required file was not found.")
+
+    return CsvGazetteer(DATA_CITIES_PATH)
+
+
+def find_city(city: str) -> dict | None:
+    return get_gazetteer().find(city)
@@ -0,0 +1,73 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class LRUCache:
+    """Thread-safe bounded LRU cache that also remembers `None` results.
+
+    Misses of the underlying lookup are stored like any other value, so
+    repeating a bad key costs a dict access instead of another lookup.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize < 1:
+            raise ValueError("Cache size must be a positive number.")
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_or_load(
+            self,
+            key: Hashable,
+            loader: Callable[[Hashable], Any]
+    ) -> Any:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                value = self._data[key]
+                self.hits += 1
+
+                if value is None:
+                    self.negative_hits += 1
+
+                return value
+
+            self.misses += 1
+
+        value = loader(key)
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.negative_hits = 0
+            self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
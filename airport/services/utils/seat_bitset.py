@@ -0,0 +1,85 @@
+import base64
+from typing import Iterable
+
+
+def seat_index(row: int, seat: int, seats_in_row: int) -> int:
+    """Position of a 1-based (row, seat) pair in row-major order."""
+    return (row - 1) * seats_in_row + seat - 1
+
+
+def bitset_size(rows: int, seats_in_row: int) -> int:
+    """Number of bytes needed for one bit per seat."""
+    return (rows * seats_in_row + 7) // 8
+
+
+def pack_seats(
+    seats: Iterable[tuple[int, int]],
+    rows: int,
+    seats_in_row: int,
+) -> bytes:
+    """Pack (row, seat) pairs into a bitset, one bit per seat.
+
+    Bit `i` of the result (byte `i // 8`, value `1 << i % 8`) is the
+    seat at row-major index `i`. Pairs outside the cabin are ignored.
+    """
+    mask = 0
+
+    for row, seat in seats:
+        if 1 <= row <= rows and 1 <= seat <= seats_in_row:
+            mask |= 1 << seat_index(row, seat, seats_in_row)
+
+    return mask.to_bytes(bitset_size(rows, seats_in_row), "little")
+
+
+def unpack_seats(
+    data: bytes,
+    rows: int,
+    seats_in_row: int,
+) -> list[tuple[int, int]]:
+    """Inverse of `pack_seats`, in row-major order."""
+    mask = int.from_bytes(data, "little")
+    seats = []
+
+    while mask:
+        index = (mask & -mask).bit_length() - 1
+
+        if index >= rows * seats_in_row:
+            break
+
+        row, seat = divmod(index, seats_in_row)
+        seats.append((row + 1, seat + 1))
+        mask &= mask - 1
+
+    return seats
+
+
+def encode_bitset(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def decode_bitset(value: str) -> bytes:
+    return base64.b64decode(value)
+
+
+def best_block(taken: int, seats_in_row: int, size: int) -> int | None:
+    """First seat of the best block of `size` free adjacent seats, or None.
+
+    `taken` has bit `seat - 1` set for every taken seat of a row. The
+    block starts the shortest free run it fits in, leftmost first, so
+    longer runs stay available for larger parties.
+    """
+    free = ~taken & ((1 << seats_in_row) - 1)
+    best = None
+
+    while free:
+        start = (free & -free).bit_length() - 1
+        # Trailing ones of the remaining free seats are the current run
+        run = free >> start
+        length = (run & ~(run + 1)).bit_length()
+
+        if length >= size and (best is None or length < best[0]):
+            best = (length, start)
+
+        free &= ~(((1 << length) - 1) << start)
+
+    return None if best is None else best[1] + 1
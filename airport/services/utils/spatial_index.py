@@ -0,0 +1,140 @@
+import math
+import os
+import threading
+import time
+from typing import Iterable
+
+from airport.services.utils.distance_calcultion import EARTH_RADIUS
+
+
+AIRPORT_INDEX_TTL = int(os.environ.get("AIRPORT_INDEX_TTL", 60))
+
+
+def to_unit_vector(lat: float, lng: float) -> tuple[float, float, float]:
+    lat, lng = math.radians(lat), math.radians(lng)
+
+    return (
+        math.cos(lat) * math.cos(lng),
+        math.cos(lat) * math.sin(lng),
+        math.sin(lat),
+    )
+
+
+class SpatialIndex:
+    """3-d tree over points of the unit sphere.
+
+    Working with 3-d vectors instead of lat/lng pairs keeps the tree
+    free of special cases at the poles and the antimeridian: the chord
+    between two vectors grows monotonically with their great-circle
+    distance, so a radius query becomes a plain euclidean one.
+    """
+
+    def __init__(self, points: Iterable[tuple[int, float, float]]) -> None:
+        nodes = [
+            (to_unit_vector(lat, lng), point_id)
+            for point_id, lat, lng in points
+        ]
+        self._size = len(nodes)
+        self._root = self._build(nodes, depth=0)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _build(self, nodes: list, depth: int) -> tuple | None:
+        if not nodes:
+            return None
+
+        axis = depth % 3
+        nodes.sort(key=lambda node: node[0][axis])
+        middle = len(nodes) // 2
+        vector, point_id = nodes[middle]
+
+        return (
+            vector,
+            point_id,
+            axis,
+            self._build(nodes[:middle], depth + 1),
+            self._build(nodes[middle + 1:], depth + 1),
+        )
+
+    def query_radius(
+            self,
+            lat: float,
+            lng: float,
+            radius: float,
+            limit: int | None = None
+    ) -> list[tuple[float, int]]:
+        """Return `(distance_km, point_id)` pairs within `radius` km."""
+        query = to_unit_vector(lat, lng)
+        central_angle = min(radius / EARTH_RADIUS, math.pi)
+        max_chord = (2 * math.sin(central_angle / 2)) ** 2
+        found = []
+        stack = [self._root]
+
+        while stack:
+            node = stack.pop()
+
+            if node is None:
+                continue
+
+            vector, point_id, axis, left, right = node
+            chord = sum((q - v) ** 2 for q, v in zip(query, vector))
+
+            if chord <= max_chord:
+                found.append((chord, point_id))
+
+            delta = query[axis] - vector[axis]
+            near, far = (left, right) if delta < 0 else (right, left)
+            stack.append(near)
+
+            if delta ** 2 <= max_chord:
+                stack.append(far)
+
+        found.sort()
+
+        return [
+            (2 * EARTH_RADIUS * math.asin(min(math.sqrt(chord) / 2, 1)),
+             point_id)
+            for chord, point_id in found[:limit]
+        ]
+
+
+class AirportIndex:
+    """Process-wide spatial index over airport coordinates.
+
+    Airport signals mark it stale in the process that made the change;
+    other workers pick the change up after `AIRPORT_INDEX_TTL` seconds.
+    """
+
+    def __init__(self, ttl: int = AIRPORT_INDEX_TTL) -> None:
+        self.ttl = ttl
+        self._index = None
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        self._index = None
+
+    def get(self) -> SpatialIndex:
+        index = self._index
+
+        if index is not None and time.monotonic() - self._built_at < self.ttl:
+            return index
+
+        with self._lock:
+            if (self._index is None
+                    or time.monotonic() - self._built_at >= self.ttl):
+                from airport.models import Airport
+
+                self._index = SpatialIndex(
+                    Airport.objects.filter(
+                        latitude__isnull=False,
+                        longitude__isnull=False,
+                    ).values_list("id", "latitude", "longitude")
+                )
+                self._built_at = time.monotonic()
+
+            return self._index
+
+
+airport_index = AirportIndex()
@@ -0,0 +1,110 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Crew,
+    Flight,
+    Route,
+    Ticket,
+)
+from airport.pagination import drop_row_count
+from airport.services.response_cache import bump_version_on_commit
+from airport.services.route_calendar import invalidate_calendars
+from airport.services.seat_counters import adjust_seats_sold, touch_flights
+from airport.services.seat_inventory import get_seat_inventory
+from airport.services.utils.distance_matrix import distance_matrix
+from airport.services.utils.spatial_index import airport_index
+
+
+# Models whose version keys cached responses and ETag validators
+VERSIONED_MODELS = (Airplane, AirplaneType, Airport, Crew, Flight, Route)
+
+
+@receiver((post_save, post_delete), sender=Airport)
+def invalidate_airport_index(sender, **kwargs):
+    airport_index.invalidate()
+
+
+@receiver(post_save, sender=Airport)
+def update_distance_matrix(sender, instance, **kwargs):
+    if distance_matrix.is_loaded and instance.has_coordinates:
+        distance_matrix.add(instance.id, instance.latitude, instance.longitude)
+
+
+@receiver(post_delete, sender=Airport)
+def remove_from_distance_matrix(sender, instance, **kwargs):
+    distance_matrix.remove(instance.id)
+
+
+@receiver((post_save, post_delete), sender=Flight)
+def invalidate_route_calendar(sender, instance, **kwargs):
+    calendars = [(instance.route_id, instance.departure_time)]
+    loaded = getattr(instance, "_loaded_calendar", (None, None))
+
+    # A flight moved to another route or month leaves its old calendar
+    if None not in loaded:
+        calendars.append(loaded)
+
+    invalidate_calendars(calendars)
+    instance._loaded_calendar = calendars[0]
+
+
+@receiver(post_save, sender=Ticket)
+def count_saved_ticket(sender, instance, created, **kwargs):
+    previous_flight_id = (
+        None if created
+        else getattr(instance, "_loaded_flight_id", instance.flight_id)
+    )
+
+    if previous_flight_id != instance.flight_id:
+        adjust_seats_sold({instance.flight_id: 1, previous_flight_id: -1})
+    else:
+        # Taken seats are part of the flight, so its ETag must change
+        touch_flights([instance.flight_id])
+
+    instance._loaded_flight_id = instance.flight_id
+
+
+@receiver(post_delete, sender=Ticket)
+def count_deleted_ticket(sender, instance, **kwargs):
+    adjust_seats_sold({instance.flight_id: -1})
+    get_seat_inventory().release(
+        instance.flight_id, [(instance.row, instance.seat)]
+    )
+
+
+@receiver(m2m_changed, sender=Flight.crew.through)
+def touch_flights_on_crew_change(sender, instance, action, reverse, **kwargs):
+    if not reverse:
+        if action.startswith("post_"):
+            touch_flights([instance.pk])
+    elif action in ("post_add", "post_remove"):
+        touch_flights(kwargs["pk_set"])
+    elif action == "pre_clear":
+        touch_flights(instance.crew_flights.values("pk"))
+
+
+@receiver(pre_delete, sender=Crew)
+def touch_flights_on_crew_delete(sender, instance, **kwargs):
+    # The cascade to Flight.crew.through sends no m2m_changed
+    touch_flights(instance.crew_flights.values("pk"))
+
+
+@receiver((post_save, post_delete))
+def drop_cached_row_count(sender, created=True, **kwargs):
+    if sender._meta.app_label == "airport" and created:
+        drop_row_count(sender)
+
+
+@receiver((post_save, post_delete))
+def bump_response_version(sender, **kwargs):
+    if sender in VERSIONED_MODELS:
+        bump_version_on_commit(sender)
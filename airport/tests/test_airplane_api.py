@@ -6,6 +6,7 @@ from rest_framework.test import APIClient
 
 from airport.models import AirplaneType, Airplane
 from airport.serializers import AirplaneSerializer
+from airport.services.response_cache import get_response_cache
 
 
 AIRPLANE_URL = reverse("airport:airplane-list")
@@ -23,6 +24,7 @@ class UnauthenticatedAirplaneApiTests(TestCase):
 
 class AuthenticatedAirplaneApiTests(TestCase):
     def setUp(self):
+        get_response_cache().clear()
         self.client = APIClient()
         self.user = get_user_model().objects.create_user(
             email="test@test.com",
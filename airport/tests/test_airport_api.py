@@ -1,14 +1,25 @@
+from datetime import timedelta
+from importlib import import_module
+from unittest import mock
+
+from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APIClient
 
-from airport.models import Airport
+from airport.models import Airplane, AirplaneType, Airport, Flight, Route
+from airport.pagination import ApproximateCountPaginator
 from airport.serializers import AirportSerializer
+from airport.services.response_cache import get_response_cache
 
 
 AIRPORT_URL = reverse("airport:airport-list")
+AIRPORT_NEARBY_URL = reverse("airport:airport-nearby")
+AIRPORT_IMPORT_URL = reverse("airport:airport-import")
 
 
 class UnauthenticatedAirportApiTests(TestCase):
@@ -23,6 +34,7 @@ class UnauthenticatedAirportApiTests(TestCase):
 
 class AuthenticatedAirportApiTests(TestCase):
     def setUp(self):
+        get_response_cache().clear()
         self.client = APIClient()
         self.user = get_user_model().objects.create_user(
             email="test@test.com",
@@ -62,9 +74,160 @@ class AuthenticatedAirportApiTests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["results"], serializer.data)
 
+    def test_city_backfill_folds_non_ascii(self):
+        airport = Airport.objects.create(
+            name="Zurich Airport", closest_big_city="Atlanta"
+        )
+        # A row saved before the column existed
+        Airport.objects.filter(id=airport.id).update(
+            closest_big_city=" ZÜRICH", city_normalized=""
+        )
+        migration = import_module(
+            "airport.migrations.0008_airport_city_normalized"
+        )
+
+        migration.fill_city_normalized(apps, None)
+        response = self.client.get(AIRPORT_URL, {"name": "zür"})
+
+        self.assertEqual(
+            [result["id"] for result in response.data["results"]],
+            [airport.id],
+        )
+
+    def test_airports_list_count(self):
+        response = self.client.get(AIRPORT_URL)
+
+        self.assertEqual(response.data["count"], 1)
+        self.assertFalse(response.data["count_approximate"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Airport.objects.create(
+                name="Kyiv Airport", closest_big_city="Kyiv"
+            )
+
+        response = self.client.get(AIRPORT_URL)
+
+        self.assertEqual(response.data["count"], 2)
+
+    def test_airports_list_is_cached_until_change(self):
+        self.assertEqual(self.client.get(AIRPORT_URL)["X-Cache"], "MISS")
+        self.assertEqual(self.client.get(AIRPORT_URL)["X-Cache"], "HIT")
+
+        self.airport.name = "Hartsfield Airport"
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.airport.save()
+
+        response = self.client.get(AIRPORT_URL)
+
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(
+            response.data["results"][0]["name"], "Hartsfield Airport"
+        )
+
+    def test_airports_filtered_count_is_capped(self):
+        for city in ("Kyiv", "New York"):
+            Airport.objects.create(name=f"{city} Airport", closest_big_city=city)
+
+        with mock.patch.object(ApproximateCountPaginator, "cap", 1):
+            response = self.client.get(
+                AIRPORT_URL, {"name": "y", "page_size": 1}
+            )
+            self.assertEqual(response.data["count"], 1)
+            self.assertTrue(response.data["count_approximate"])
+            self.assertIsNotNone(response.data["next"])
+
+            response = self.client.get(
+                AIRPORT_URL, {"name": "y", "page_size": 1, "page": 2}
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data["results"]), 1)
+            self.assertIsNone(response.data["next"])
+
+    def test_airports_nearby(self):
+        Airport.objects.create(
+            name="New York Airport",
+            closest_big_city="New York"
+        )
+        Airport.objects.create(
+            name="Kyiv Airport",
+            closest_big_city="Kyiv"
+        )
+
+        response = self.client.get(
+            AIRPORT_NEARBY_URL,
+            {"lat": 33.7, "lng": -84.4, "radius": 2000}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [airport["name"] for airport in response.data],
+            ["Atlanta Airport", "New York Airport"]
+        )
+        self.assertLess(response.data[0]["distance"], 10)
+        self.assertAlmostEqual(response.data[1]["distance"], 1200, delta=50)
+
+    def test_airport_departures_and_arrivals(self):
+        destination = Airport.objects.create(
+            name="New York Airport",
+            closest_big_city="New York"
+        )
+        route = Route.objects.create(
+            source=self.airport, destination=destination, distance=0
+        )
+        airplane = Airplane.objects.create(
+            name="B737",
+            rows=20,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="SM"),
+        )
+        now = timezone.now()
+
+        for departure in (-1, 1, 3, 10):
+            Flight.objects.create(
+                route=route,
+                airplane=airplane,
+                departure_time=now + timedelta(hours=departure),
+                arrival_time=now + timedelta(hours=departure + 2),
+            )
+
+        response = self.client.get(
+            reverse("airport:airport-departures", args=[self.airport.id])
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(response.data[0]["arrival_city"], "New York")
+
+        response = self.client.get(
+            reverse("airport:airport-arrivals", args=[destination.id]),
+            {"hours": 12, "limit": 2},
+        )
+
+        self.assertEqual(
+            [flight["departure_time"] for flight in response.data],
+            sorted(flight["departure_time"] for flight in response.data),
+        )
+        self.assertEqual(len(response.data), 2)
+
+        response = self.client.get(
+            reverse("airport:airport-arrivals", args=[self.airport.id])
+        )
+
+        self.assertEqual(response.data, [])
+
+    def test_airports_nearby_invalid_params(self):
+        response = self.client.get(
+            AIRPORT_NEARBY_URL,
+            {"lat": 100, "lng": 0, "radius": 100}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
 
 class AdminAirportTests(TestCase):
     def setUp(self):
+        get_response_cache().clear()
         self.client = APIClient()
         self.admin = get_user_model().objects.create_superuser(
             email="test@test.com",
@@ -83,3 +246,63 @@ class AdminAirportTests(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data, serializer.data)
+
+    def test_airport_bulk_import(self):
+        Airport.objects.create(name="Kyiv Airport", closest_big_city="Kyiv")
+        data = [
+            {"name": "Atlanta Airport", "closest_big_city": "Atlanta"},
+            {"name": "Dnipro Airport", "closest_big_city": "Dnipro"},
+            {"name": "Kyiv Airport", "closest_big_city": "Kyiv"},
+            {"name": "Atlantis Airport", "closest_big_city": "Atlantis"},
+            {"name": "Atlanta Airport", "closest_big_city": "Atlanta"},
+            {"closest_big_city": "Atlanta"},
+        ]
+        response = self.client.post(AIRPORT_IMPORT_URL, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(
+            [error["row"] for error in response.data["errors"]],
+            [3, 4, 5, 6]
+        )
+        self.assertIn("name", response.data["errors"][3]["errors"])
+        self.assertIsNotNone(
+            Airport.objects.get(name="Dnipro Airport").latitude
+        )
+
+    def test_airport_bulk_import_csv(self):
+        # Caches the exact count, which the import must drop
+        self.client.get(AIRPORT_URL)
+        upload = SimpleUploadedFile(
+            "airports.csv",
+            b"name,closest_big_city\n"
+            b"Atlanta Airport,Atlanta\n"
+            b"Kyiv Airport,Kyiv\n",
+            content_type="text/csv",
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                AIRPORT_IMPORT_URL, {"file": upload}, format="multipart"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["errors"], [])
+        self.assertEqual(Airport.objects.count(), 2)
+        self.assertEqual(self.client.get(AIRPORT_URL).data["count"], 2)
+
+    def test_airport_bulk_import_csv_not_utf8(self):
+        upload = SimpleUploadedFile(
+            "airports.csv",
+            "name,closest_big_city\nK\u00f6ln Airport,K\u00f6ln\n".encode(
+                "latin-1"
+            ),
+            content_type="text/csv",
+        )
+        response = self.client.post(
+            AIRPORT_IMPORT_URL, {"file": upload}, format="multipart"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("file", response.data)
@@ -0,0 +1,59 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+
+CITY_AUTOCOMPLETE_URL = reverse("airport:city-autocomplete")
+
+
+class UnauthenticatedCityApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_auth_required(self):
+        response = self.client.get(CITY_AUTOCOMPLETE_URL, {"q": "kyi"})
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AuthenticatedCityApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_autocomplete_by_prefix(self):
+        response = self.client.get(CITY_AUTOCOMPLETE_URL, {"q": "new"})
+        names = [city["name"] for city in response.data]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(names[0], "New York")
+        self.assertTrue(all(name.lower().startswith("new") for name in names))
+
+    def test_autocomplete_ranked_by_population(self):
+        response = self.client.get(CITY_AUTOCOMPLETE_URL, {"q": "s"})
+        populations = [city["population"] for city in response.data]
+
+        self.assertEqual(len(populations), 10)
+        self.assertEqual(populations, sorted(populations, reverse=True))
+
+    def test_autocomplete_local_name(self):
+        response = self.client.get(CITY_AUTOCOMPLETE_URL, {"q": "São P"})
+
+        self.assertEqual(response.data[0]["name"], "Sao Paulo")
+        self.assertEqual(response.data[0]["local_name"], "São Paulo")
+
+    def test_autocomplete_typo(self):
+        response = self.client.get(CITY_AUTOCOMPLETE_URL, {"q": "Atlnta"})
+
+        self.assertEqual(response.data[0]["name"], "Atlanta")
+
+    def test_autocomplete_query_required(self):
+        response = self.client.get(CITY_AUTOCOMPLETE_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -6,6 +6,7 @@ from rest_framework.test import APIClient
 
 from airport.models import Crew
 from airport.serializers import CrewSerializer
+from airport.services.response_cache import get_response_cache
 
 CREW_URL = reverse("airport:crew-list")
 
@@ -22,6 +23,7 @@ class UnauthenticatedCrewApiTests(TestCase):
 
 class AuthenticatedCrewApiTests(TestCase):
     def setUp(self):
+        get_response_cache().clear()
         self.client = APIClient()
         self.user = get_user_model().objects.create_user(
             email="test@test.com",
@@ -1,4 +1,10 @@
+import base64
+import json
+from datetime import timedelta
+from io import StringIO
+
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.test import TestCase
 from django.utils.timezone import now
 from rest_framework import status
@@ -12,14 +18,19 @@ from airport.models import (
     Airplane,
     Flight,
     Crew,
+    SeatHold,
+    Ticket,
 )
 from airport.serializers import (
     FlightListSerializer,
     FlightDetailSerializer, FlightSerializer
 )
+from airport.services.response_cache import get_response_cache
+from airport.services.utils.seat_bitset import decode_bitset, unpack_seats
 
 
 FLIGHT_URL = reverse("airport:flight-list")
+ORDER_URL = reverse("airport:order-list")
 
 
 class UnauthenticatedFlightApiTests(TestCase):
@@ -34,6 +45,7 @@ class UnauthenticatedFlightApiTests(TestCase):
 
 class AuthenticatedTicketApiTests(TestCase):
     def setUp(self):
+        get_response_cache().clear()
         self.client = APIClient()
         self.user = get_user_model().objects.create_user(
             email="test@test.com",
@@ -97,6 +109,136 @@ class AuthenticatedTicketApiTests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["results"], serializer.data)
 
+    def test_flights_list_not_modified(self):
+        response = self.client.get(FLIGHT_URL)
+        etag = response["ETag"]
+
+        # The validators are cached until a flight changes
+        with self.assertNumQueries(0):
+            response = self.client.get(FLIGHT_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.create(row=1, seat=1, flight=self.flight)
+
+        response = self.client.get(FLIGHT_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_flight_retrieve_etag_follows_crew(self):
+        url = reverse("airport:flight-detail", args=[self.flight.id])
+        etag = self.client.get(url)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.flight.crew.remove(self.crew_2)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["crew"]), 1)
+
+    def test_flight_retrieve_etag_follows_deleted_crew(self):
+        url = reverse("airport:flight-detail", args=[self.flight.id])
+        etag = self.client.get(url)["ETag"]
+
+        # Not the most recently updated crew member
+        with self.captureOnCommitCallbacks(execute=True):
+            self.crew_1.delete()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["crew"]), 1)
+
+    def test_flight_seat_map(self):
+        Ticket.objects.create(row=1, seat=1, flight=self.flight)
+        Ticket.objects.create(row=20, seat=6, flight=self.flight)
+        url = reverse("airport:flight-seat-map", args=[self.flight.id])
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["rows"], 20)
+        self.assertEqual(response.data["seats_taken"], 2)
+        taken = decode_bitset(response.data["taken"])
+        self.assertEqual(len(taken), 15)
+        self.assertEqual(unpack_seats(taken, 20, 6), [(1, 1), (20, 6)])
+
+    def test_seat_hold_and_order(self):
+        url = reverse("airport:flight-holds", args=[self.flight.id])
+        seats = [{"row": 1, "seat": 1}, {"row": 1, "seat": 2}]
+        tickets = [dict(seat, flight=self.flight.id) for seat in seats]
+        other_client = APIClient()
+        other_client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="other@test.com", password="testpassword"
+            )
+        )
+
+        response = self.client.post(url, {"seats": seats}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        token = response.data["token"]
+
+        response = other_client.post(
+            url, {"seats": seats[1:]}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = other_client.post(
+            ORDER_URL, {"order_tickets": tickets[:1]}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(
+            ORDER_URL,
+            {"order_tickets": tickets, "hold_token": token},
+            format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_own_held_seats_are_ordered_without_token(self):
+        url = reverse("airport:flight-holds", args=[self.flight.id])
+        seats = [{"row": 2, "seat": 1}]
+
+        self.client.post(url, {"seats": seats}, format="json")
+        response = self.client.post(
+            ORDER_URL,
+            {"order_tickets": [dict(seats[0], flight=self.flight.id)]},
+            format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_seat_hold_out_of_cabin(self):
+        url = reverse("airport:flight-holds", args=[self.flight.id])
+        response = self.client.post(
+            url, {"seats": [{"row": 21, "seat": 1}]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_sweep_seat_holds(self):
+        for seat, minutes in ((1, -5), (2, -1), (3, 5)):
+            SeatHold.objects.create(
+                flight=self.flight,
+                row=1,
+                seat=seat,
+                token="6f1c34c5-5b0e-4a53-9f3a-0c8f7b0d7a11",
+                user=self.user,
+                expires_at=now() + timedelta(minutes=minutes),
+            )
+
+        call_command("sweep_seat_holds", batch_size=1, stdout=StringIO())
+
+        self.assertEqual(
+            list(SeatHold.objects.values_list("seat", flat=True)), [3]
+        )
+
     def test_flight_retrieve(self):
         url = reverse("airport:flight-detail", args=[self.flight.id])
         serializer = FlightDetailSerializer(self.flight)
@@ -180,6 +322,72 @@ class AuthenticatedTicketApiTests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["results"], serializer.data)
 
+    def test_flights_keyset_pagination(self):
+        for departure_time in ("2025-01-01 10:00:00", "2025-01-02 15:00:00"):
+            Flight.objects.create(
+                route=self.route,
+                airplane=self.airplane,
+                departure_time=departure_time,
+                arrival_time="2025-01-03 20:00:00"
+            )
+        expected_ids = list(
+            Flight.objects.order_by("departure_time", "id")
+            .values_list("id", flat=True)
+        )
+
+        pages = []
+        url = f"{FLIGHT_URL}?page_size=1"
+
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append(response.data)
+            url = response.data["next"]
+
+        self.assertEqual(
+            [page["results"][0]["id"] for page in pages], expected_ids
+        )
+        self.assertNotIn("count", pages[0])
+        self.assertIsNone(pages[0]["previous"])
+
+        response = self.client.get(pages[-1]["previous"])
+
+        self.assertEqual(response.data["results"][0]["id"], expected_ids[1])
+
+    def test_flights_invalid_cursor(self):
+        response = self.client.get(FLIGHT_URL, {"cursor": "invalid"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        for position in (["abc", 1], ["2025-01-02T15:00:00", "x"], [[], 1]):
+            cursor = base64.urlsafe_b64encode(
+                json.dumps({"p": position, "r": 0}).encode()
+            ).decode()
+            response = self.client.get(FLIGHT_URL, {"cursor": cursor})
+
+            self.assertEqual(
+                response.status_code, status.HTTP_404_NOT_FOUND
+            )
+
+    def test_flights_filter_by_departure_date_range(self):
+        cases = (
+            ({"departure_date": "2025-01-02"}, 1),
+            ({"departure_date": "2025-01-03"}, 0),
+            ({"departure_after": "2025-01-02"}, 1),
+            ({"departure_after": "2025-01-03"}, 0),
+            ({"departure_before": "2025-01-02"}, 1),
+            ({"departure_before": "2025-01-01"}, 0),
+        )
+
+        for params, expected_count in cases:
+            with self.subTest(params=params):
+                response = self.client.get(FLIGHT_URL, params)
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(
+                    len(response.data["results"]), expected_count
+                )
+
     def test_flights_filter_by_arrival_time(self):
         today = now().date()
 
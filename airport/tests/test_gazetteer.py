@@ -0,0 +1,75 @@
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from airport.services.utils.gazetteer import (
+    DATA_CITIES_PATH,
+    CompiledGazetteer,
+    CsvGazetteer,
+)
+from airport.services.utils.lru_cache import LRUCache
+
+
+class CompiledGazetteerTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.output = os.path.join(directory.name, "cities.bin")
+        call_command(
+            "compile_cities",
+            source=DATA_CITIES_PATH,
+            output=self.output,
+            stdout=open(os.devnull, "w"),
+        )
+        self.compiled = CompiledGazetteer(self.output)
+        self.csv = CsvGazetteer(DATA_CITIES_PATH)
+
+    def test_lookup_matches_csv(self):
+        for city in ("Atlanta", "new york", " Kyiv ", "Sao Paulo"):
+            compiled = self.compiled.find(city)
+            expected = self.csv.find(city)
+
+            self.assertIsNotNone(compiled)
+            self.assertAlmostEqual(compiled["lat"], expected["lat"], 4)
+            self.assertAlmostEqual(compiled["lng"], expected["lng"], 4)
+
+    def test_unknown_city(self):
+        self.assertIsNone(self.compiled.find("Atlantis"))
+        self.assertIsNone(self.compiled.find(""))
+        self.assertIsNone(self.compiled.find("zzzz"))
+
+
+class CityCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.cache = LRUCache(maxsize=2)
+        self.calls = []
+
+    def load(self, key):
+        self.calls.append(key)
+
+        return None if key == "atlantis" else key.upper()
+
+    def test_misses_are_remembered(self):
+        self.assertIsNone(self.cache.get_or_load("atlantis", self.load))
+        self.assertIsNone(self.cache.get_or_load("atlantis", self.load))
+
+        self.assertEqual(self.calls, ["atlantis"])
+        self.assertEqual(self.cache.stats()["negative_hits"], 1)
+
+    def test_least_recently_used_is_evicted(self):
+        self.cache.get_or_load("kyiv", self.load)
+        self.cache.get_or_load("dnipro", self.load)
+        self.cache.get_or_load("kyiv", self.load)
+        self.cache.get_or_load("atlanta", self.load)
+        self.cache.get_or_load("kyiv", self.load)
+        self.cache.get_or_load("dnipro", self.load)
+
+        stats = self.cache.stats()
+
+        self.assertEqual(self.calls, ["kyiv", "dnipro", "atlanta", "dnipro"])
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 4)
+        self.assertEqual(stats["evictions"], 2)
+        self.assertEqual(stats["size"], 2)
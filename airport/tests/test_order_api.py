@@ -1,12 +1,26 @@
+from io import StringIO
+from uuid import uuid4
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from django.utils.timezone import now
 from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APIClient
 
-from airport.models import Order
+from airport.models import (
+    Airport,
+    Route,
+    AirplaneType,
+    Airplane,
+    Flight,
+    Ticket,
+    Order,
+    OrderRequest,
+)
 from airport.serializers import OrderListSerializer
+from airport.services.order_queue import claim_requests, process_request
 
 
 ORDER_URL = reverse("airport:order-list")
@@ -103,3 +117,130 @@ class AdminOrderTests(TestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(ORDER_ASYNC_INTAKE=True)
+class AsyncOrderIntakeTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        route = Route.objects.create(
+            source=Airport.objects.create(
+                name="Atlanta Airport",
+                closest_big_city="Atlanta"
+            ),
+            destination=Airport.objects.create(
+                name="New York Airport",
+                closest_big_city="New York"
+            ),
+            distance=1000
+        )
+        airplane = Airplane.objects.create(
+            name="B737",
+            rows=20,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="SM"),
+        )
+        self.flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time="2025-01-02 15:00:00",
+            arrival_time="2025-01-03 15:00:00"
+        )
+
+    def order(self, *seats):
+        return self.client.post(
+            ORDER_URL,
+            {
+                "order_tickets": [
+                    {"row": row, "seat": seat, "flight": self.flight.id}
+                    for row, seat in seats
+                ]
+            },
+            format="json",
+        )
+
+    def test_order_is_queued(self):
+        response = self.order((12, 1), (12, 2))
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], "PENDING")
+        self.assertEqual(response["Location"], response.data["url"])
+        self.assertFalse(Order.objects.exists())
+
+        call_command("process_order_queue", workers=1, stdout=StringIO())
+
+        response = self.client.get(response["Location"])
+        order_request = OrderRequest.objects.get()
+
+        self.assertEqual(response.data["status"], "DONE")
+        self.assertEqual(response.data["order"], order_request.order_id)
+        self.assertEqual(
+            Ticket.objects.filter(order=order_request.order).count(), 2
+        )
+
+    def test_intake_checks_shape_only(self):
+        response = self.order((0, 1))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(OrderRequest.objects.exists())
+
+        response = self.order((99, 1))
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+    def test_rejected_order_keeps_errors(self):
+        self.order((13, 1))
+        self.order((13, 1), (13, 2))
+
+        call_command("process_order_queue", workers=1, stdout=StringIO())
+
+        done, failed = OrderRequest.objects.order_by("created_at")
+
+        self.assertEqual(done.status, "DONE")
+        self.assertEqual(failed.status, "FAILED")
+        self.assertEqual(
+            failed.errors,
+            [f"Row 13 seat 1 on flight {self.flight.id} is already taken."]
+        )
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_claimed_requests_are_not_claimed_again(self):
+        self.order((14, 1))
+        self.order((14, 2))
+
+        first = claim_requests(1)
+        second = claim_requests(5)
+
+        self.assertEqual(len(first), 1)
+        self.assertEqual(len(second), 1)
+        self.assertNotEqual(first[0].id, second[0].id)
+        self.assertEqual(claim_requests(5), [])
+
+    def test_request_claimed_again_is_left_to_new_worker(self):
+        self.order((16, 1))
+        order_request = claim_requests(1)[0]
+        # Claimed again by another worker after the claim timeout
+        OrderRequest.objects.update(worker=uuid4())
+
+        process_request(order_request)
+        order_request.refresh_from_db()
+
+        self.assertEqual(order_request.status, "PROCESSING")
+        self.assertFalse(Order.objects.exists())
+
+    def test_other_users_cannot_see_requests(self):
+        response = self.order((15, 1))
+        other = get_user_model().objects.create_user(
+            email="other@test.com",
+            password="password123"
+        )
+        self.client.force_authenticate(other)
+
+        response = self.client.get(response["Location"])
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
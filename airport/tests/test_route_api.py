@@ -1,18 +1,30 @@
+from io import StringIO
+
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.test import TestCase
 from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APIClient
 
-from airport.models import Airport, Route
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Flight,
+    Route,
+    Ticket,
+)
 from airport.serializers import (
     RouteSerializer,
     RouteListSerializer,
     RouteDetailSerializer
 )
+from airport.services.response_cache import get_response_cache
 
 
 ROUTE_URL = reverse("airport:route-list")
+DISTANCE_MATRIX_URL = reverse("airport:route-distance-matrix")
 
 
 class UnauthenticatedRouteApiTests(TestCase):
@@ -27,6 +39,7 @@ class UnauthenticatedRouteApiTests(TestCase):
 
 class AuthenticatedRouteApiTests(TestCase):
     def setUp(self):
+        get_response_cache().clear()
         self.client = APIClient()
         self.user = get_user_model().objects.create_user(
             email="test@test.com",
@@ -81,6 +94,39 @@ class AuthenticatedRouteApiTests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data, serializer.data)
 
+    def test_route_retrieve_cache_follows_airports(self):
+        url = reverse("airport:route-detail", args=[self.route.id])
+        self.client.get(url)
+
+        self.assertEqual(self.client.get(url)["X-Cache"], "HIT")
+
+        self.source_airport.name = "Hartsfield Airport"
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.source_airport.save()
+
+        response = self.client.get(url)
+
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(
+            response.data["source"]["name"], "Hartsfield Airport"
+        )
+
+    def test_routes_list_etag_follows_airports(self):
+        etag = self.client.get(ROUTE_URL)["ETag"]
+        response = self.client.get(ROUTE_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.destination_airport.name = "JFK Airport"
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.destination_airport.save()
+
+        response = self.client.get(ROUTE_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
     def test_routes_filter_by_source_city(self):
         response = self.client.get(
             ROUTE_URL,
@@ -96,6 +142,17 @@ class AuthenticatedRouteApiTests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["results"], serializer.data)
 
+    def test_routes_filter_by_city_part_ignores_case(self):
+        response = self.client.get(ROUTE_URL, {"destination_city": " YORK"})
+
+        self.assertEqual(
+            [route["id"] for route in response.data["results"]],
+            [self.route.id]
+        )
+        self.assertEqual(
+            self.destination_airport.city_normalized, "new york"
+        )
+
     def test_routes_filter_by_destination_city(self):
         response = self.client.get(
             ROUTE_URL,
@@ -111,10 +168,93 @@ class AuthenticatedRouteApiTests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["results"], serializer.data)
 
+    def test_route_calendar(self):
+        airplane = Airplane.objects.create(
+            name="B737",
+            rows=20,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="SM"),
+        )
+
+        for departure_time in (
+            "2025-03-05 18:00:00+00:00",
+            "2025-03-05 09:00:00+00:00",
+            "2025-03-20 09:00:00+00:00",
+            "2025-04-01 09:00:00+00:00",
+        ):
+            Flight.objects.create(
+                route=self.route,
+                airplane=airplane,
+                departure_time=departure_time,
+                arrival_time="2025-04-02 09:00:00+00:00",
+            )
+
+        url = reverse("airport:route-calendar", args=[self.route.id])
+        response = self.client.get(url, {"month": "2025-03"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(day["date"], day["flights"]) for day in response.data],
+            [("2025-03-05", 2), ("2025-03-20", 1)]
+        )
+        self.assertEqual(
+            response.data[0]["first_departure"], "2025-03-05T09:00:00Z"
+        )
+        self.assertEqual(response.data[0]["seats_available"], 240)
+
+        flight = Flight.objects.get(departure_time__date="2025-03-20")
+        Ticket.objects.create(row=1, seat=1, flight=flight)
+        response = self.client.get(url, {"month": "2025-03"})
+
+        self.assertEqual(response.data[1]["seats_available"], 119)
+
+        # Moving a flight to another month drops it from the old one
+        flight = Flight.objects.get(id=flight.id)
+        flight.departure_time = "2025-04-01 12:00:00+00:00"
+        flight.save()
+        response = self.client.get(url, {"month": "2025-03"})
+
+        self.assertEqual(
+            [(day["date"], day["flights"]) for day in response.data],
+            [("2025-03-05", 2)]
+        )
+
+        response = self.client.get(url, {"month": "March"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_distance_matrix(self):
+        airport_ids = [
+            self.source_airport.id,
+            self.destination_airport.id,
+            self.source_airport_2.id,
+        ]
+        response = self.client.get(
+            DISTANCE_MATRIX_URL,
+            {"ids": ",".join(map(str, airport_ids))}
+        )
+        distances = response.data["distances"]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["ids"], airport_ids)
+        self.assertEqual(distances[0][0], 0)
+        self.assertEqual(distances[0][1], distances[1][0])
+        self.assertAlmostEqual(distances[0][1], 1205.8, delta=0.1)
+        self.assertGreater(distances[0][2], distances[0][1])
+
+    def test_distance_matrix_unknown_airport(self):
+        response = self.client.get(
+            DISTANCE_MATRIX_URL,
+            {"ids": f"{self.source_airport.id},0"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
 
 
 class AdminRouteTests(TestCase):
     def setUp(self):
+        get_response_cache().clear()
         self.client = APIClient()
         self.admin = get_user_model().objects.create_superuser(
             email="test@test.com",
@@ -142,3 +282,18 @@ class AdminRouteTests(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data, serializer.data)
+
+    def test_recompute_route_distances(self):
+        route = Route.objects.create(
+            source=self.source_airport,
+            destination=self.destination_airport,
+            distance=0
+        )
+        route.refresh_from_db()
+        expected_distance = route.distance
+        Route.objects.filter(id=route.id).update(distance=1)
+
+        call_command("recompute_route_distances", stdout=StringIO())
+        route.refresh_from_db()
+
+        self.assertEqual(route.distance, expected_distance)
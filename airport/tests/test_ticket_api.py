@@ -1,5 +1,14 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from uuid import uuid4
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APIClient
@@ -12,16 +21,30 @@ from airport.models import (
     Flight,
     Crew,
     Ticket,
-    Order
+    Order,
+    IdempotencyKey,
+    SeatHold
 )
 from airport.serializers import (
     TicketListSerializer,
     TicketDetailSerializer,
     TicketSerializer
 )
+from airport.services.seat_assignment import assign_seats
+from airport.services.seat_holds import check_holds
+from airport.services.seat_inventory import (
+    CacheSeatInventory,
+    LocalSeatInventory,
+    SeatInventory,
+    SeatsTaken,
+    is_seat_conflict,
+    reserve_seats,
+)
+from airport.services.utils.seat_bitset import best_block
 
 
 TICKET_URL = reverse("airport:ticket-list")
+ORDER_URL = reverse("airport:order-list")
 
 
 class UnauthenticatedTicketApiTests(TestCase):
@@ -241,3 +264,413 @@ class AdminTicketTests(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data, serializer.data)
+
+    def test_seats_sold_counter(self):
+        flight_2 = Flight.objects.create(
+            route=self.route_2,
+            airplane=self.airplane_2,
+            departure_time="2025-01-04 15:00:00",
+            arrival_time="2025-01-05 15:00:00"
+        )
+        response = self.client.post(
+            TICKET_URL, {"row": 1, "seat": 1, "flight": self.flight.id}
+        )
+        url = reverse("airport:ticket-detail", args=[response.data["id"]])
+        self.flight.refresh_from_db()
+
+        self.assertEqual(self.flight.seats_sold, 1)
+
+        self.client.put(url, {"row": 1, "seat": 1, "flight": flight_2.id})
+        self.flight.refresh_from_db()
+        flight_2.refresh_from_db()
+
+        self.assertEqual(self.flight.seats_sold, 0)
+        self.assertEqual(flight_2.seats_sold, 1)
+
+        self.client.delete(url)
+        flight_2.refresh_from_db()
+
+        self.assertEqual(flight_2.seats_sold, 0)
+
+    def test_seats_sold_counter_with_deferred_flight(self):
+        Ticket.objects.create(row=1, seat=1, flight=self.flight)
+
+        ticket = Ticket.objects.only("row", "seat").get()
+        ticket.seat = 2
+        ticket.save()
+        self.flight.refresh_from_db()
+
+        self.assertEqual(self.flight.seats_sold, 1)
+
+    def test_reconcile_seat_counters(self):
+        Ticket.objects.create(row=1, seat=1, flight=self.flight)
+        Flight.objects.filter(id=self.flight.id).update(seats_sold=10)
+
+        call_command("reconcile_seat_counters", stdout=StringIO())
+        self.flight.refresh_from_db()
+
+        self.assertEqual(self.flight.seats_sold, 1)
+
+    def test_taken_seat_is_rejected(self):
+        data = {"row": 2, "seat": 3, "flight": self.flight.id}
+
+        response = self.client.post(TICKET_URL, data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.post(TICKET_URL, data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_order_with_taken_seat_is_rolled_back(self):
+        Ticket.objects.create(row=1, seat=2, flight=self.flight)
+        tickets = [
+            {"row": 1, "seat": 1, "flight": self.flight.id},
+            {"row": 1, "seat": 2, "flight": self.flight.id},
+        ]
+
+        response = self.client.post(
+            ORDER_URL, {"order_tickets": tickets}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+        response = self.client.post(
+            ORDER_URL, {"order_tickets": tickets[:1]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_order_with_seat_listed_twice(self):
+        tickets = [{"row": 1, "seat": 1, "flight": self.flight.id}] * 2
+
+        response = self.client.post(
+            ORDER_URL, {"order_tickets": tickets}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data,
+            [f"Row 1 seat 1 on flight {self.flight.id} is listed twice."],
+        )
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_order_tickets_are_created_in_bulk(self):
+        tickets = [
+            {"row": 3, "seat": seat, "flight": self.flight.id}
+            for seat in range(1, 7)
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                ORDER_URL, {"order_tickets": tickets}, format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            len([
+                query for query in queries
+                if query["sql"].startswith("INSERT INTO \"airport_ticket\"")
+            ]),
+            1
+        )
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_sold, 6)
+
+    def test_preloaded_flights_stay_out_of_the_context(self):
+        context = {}
+        serializer = TicketSerializer(
+            data=[{"row": 3, "seat": 1, "flight": self.flight.id}],
+            many=True,
+            context=context,
+        )
+
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(context, {})
+        self.assertEqual(
+            serializer.validated_data[0]["flight"], self.flight
+        )
+
+    def test_order_reports_every_taken_seat(self):
+        Ticket.objects.create(row=1, seat=1, flight=self.flight)
+        Ticket.objects.create(row=1, seat=2, flight=self.flight)
+        tickets = [
+            {"row": 1, "seat": seat, "flight": self.flight.id}
+            for seat in range(1, 4)
+        ]
+
+        response = self.client.post(
+            ORDER_URL, {"order_tickets": tickets}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(response.data), 2)
+
+    def test_seat_inventory_backends_are_complete(self):
+        class PartialInventory(SeatInventory):
+            def release(self, flight_id, seats):
+                pass
+
+        with self.assertRaises(TypeError):
+            PartialInventory()
+
+    def test_only_seat_conflicts_become_validation_errors(self):
+        ticket = Ticket(row=4, seat=4, flight=self.flight)
+
+        Ticket.objects.create(row=1, seat=1, flight=self.flight)
+
+        with self.assertRaises(IntegrityError) as raised:
+            with transaction.atomic():
+                Ticket.objects.bulk_create(
+                    [Ticket(row=1, seat=1, flight=self.flight)]
+                )
+        self.assertTrue(is_seat_conflict(raised.exception))
+
+        with self.assertRaises(IntegrityError):
+            with reserve_seats([ticket]):
+                raise IntegrityError("NOT NULL constraint failed: x.y")
+
+        # The seat was given back
+        with reserve_seats([ticket]):
+            pass
+
+    def test_order_idempotency_key(self):
+        tickets = [{"row": 4, "seat": 1, "flight": self.flight.id}]
+        headers = {"HTTP_IDEMPOTENCY_KEY": "order-1"}
+
+        first = self.client.post(
+            ORDER_URL, {"order_tickets": tickets}, format="json", **headers
+        )
+        retry = self.client.post(
+            ORDER_URL, {"order_tickets": tickets}, format="json", **headers
+        )
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(Ticket.objects.count(), 1)
+
+        tickets[0]["seat"] = 2
+        response = self.client.post(
+            ORDER_URL, {"order_tickets": tickets}, format="json", **headers
+        )
+
+        self.assertEqual(
+            response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+
+    def test_failed_order_releases_idempotency_key(self):
+        Ticket.objects.create(row=4, seat=1, flight=self.flight)
+        tickets = [{"row": 4, "seat": 1, "flight": self.flight.id}]
+        headers = {"HTTP_IDEMPOTENCY_KEY": "order-2"}
+
+        response = self.client.post(
+            ORDER_URL, {"order_tickets": tickets}, format="json", **headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        Ticket.objects.all().delete()
+        response = self.client.post(
+            ORDER_URL, {"order_tickets": tickets}, format="json", **headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_stale_idempotency_key_is_taken_over(self):
+        tickets = [{"row": 4, "seat": 1, "flight": self.flight.id}]
+        headers = {"HTTP_IDEMPOTENCY_KEY": "order-3"}
+
+        self.client.post(
+            ORDER_URL, {"order_tickets": tickets}, format="json", **headers
+        )
+        # The first request died before storing its response
+        Order.objects.all().delete()
+        record = IdempotencyKey.objects.get(key="order-3")
+        record.response_status = None
+        record.response_body = None
+        record.locked_until = timezone.now() + timedelta(minutes=1)
+        record.save()
+
+        response = self.client.post(
+            ORDER_URL, {"order_tickets": tickets}, format="json", **headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+        record.locked_until = timezone.now() - timedelta(seconds=1)
+        record.save(update_fields=("locked_until",))
+
+        response = self.client.post(
+            ORDER_URL, {"order_tickets": tickets}, format="json", **headers
+        )
+        record.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(record.response_status, status.HTTP_201_CREATED)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_seat_inventories_recheck_database(self):
+        ticket = Ticket.objects.create(row=1, seat=1, flight=self.flight)
+
+        for inventory in (LocalSeatInventory(), CacheSeatInventory()):
+            self.assertEqual(inventory.reserve(self.flight, [(1, 2)]), [])
+            self.assertEqual(
+                inventory.reserve(self.flight, [(1, 3), (1, 1)]), [(1, 1)]
+            )
+            # Released elsewhere: the stale entry is checked again
+            inventory.release(self.flight.id, [(1, 3)])
+            self.assertEqual(inventory.reserve(self.flight, [(1, 3)]), [])
+            Ticket.objects.filter(id=ticket.id).update(seat=4)
+            self.assertEqual(inventory.reserve(self.flight, [(1, 1)]), [])
+            Ticket.objects.filter(id=ticket.id).update(seat=1)
+            # A seat reserved by a running request survives the recheck
+            self.assertEqual(
+                inventory.reserve(self.flight, [(1, 5), (1, 2)]), [(1, 2)]
+            )
+            inventory.release(self.flight.id, [(1, 1), (1, 2), (1, 3)])
+
+    def test_cache_inventory_reports_seat_released_meanwhile(self):
+        inventory = CacheSeatInventory()
+        self.addCleanup(inventory.cache.clear)
+        self.assertEqual(inventory.reserve(self.flight, [(2, 1)]), [])
+
+        # The conflicting key expires before it is read back
+        with mock.patch.object(inventory.cache, "get", return_value=None):
+            self.assertEqual(
+                inventory._take(self.flight, [(2, 2), (2, 1)]), [(2, 1)]
+            )
+
+        self.assertEqual(inventory.reserve(self.flight, [(2, 2)]), [])
+
+    def test_order_auto_assign(self):
+        Ticket.objects.create(row=5, seat=3, flight=self.flight)
+        data = {
+            "auto_assign": {"flight": self.flight.id, "seats": 3, "rows": [5]}
+        }
+
+        first = self.client.post(ORDER_URL, data, format="json")
+        second = self.client.post(ORDER_URL, data, format="json")
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [(t["row"], t["seat"]) for t in first.data["order_tickets"]],
+            [(5, 4), (5, 5), (5, 6)],
+        )
+        # Row 5 has only two free adjacent seats left
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [(t["row"], t["seat"]) for t in second.data["order_tickets"]],
+            [(4, 1), (4, 2), (4, 3)],
+        )
+
+    def test_auto_assign_tries_next_block_on_conflict(self):
+        attempts = []
+
+        def book(tickets):
+            seats = [(ticket.row, ticket.seat) for ticket in tickets]
+            attempts.append(seats)
+
+            if (7, 2) in seats:
+                # Sold by an explicit order committed after the seats
+                # of the flight were read
+                raise SeatsTaken({self.flight.id: [(7, 2)]})
+
+            return seats
+
+        booked = assign_seats(self.flight, 3, book, rows=[7])
+
+        self.assertEqual(booked, [(7, 3), (7, 4), (7, 5)])
+        self.assertEqual(
+            attempts, [[(7, 1), (7, 2), (7, 3)], [(7, 3), (7, 4), (7, 5)]]
+        )
+
+    def test_auto_assign_skips_seats_held_meanwhile(self):
+        attempts = []
+        other = get_user_model().objects.create_user(
+            email="other@test.com", password="testpassword"
+        )
+
+        def book(tickets):
+            seats = [(ticket.row, ticket.seat) for ticket in tickets]
+            attempts.append(seats)
+
+            if len(attempts) == 1:
+                # Held by another customer after the seats were read
+                SeatHold.objects.create(
+                    flight=self.flight,
+                    row=8,
+                    seat=2,
+                    token=uuid4(),
+                    user=other,
+                    expires_at=timezone.now() + timedelta(minutes=5),
+                )
+
+            check_holds(tickets, self.admin, None)
+
+            return seats
+
+        booked = assign_seats(self.flight, 3, book, rows=[8])
+
+        self.assertEqual(booked, [(8, 3), (8, 4), (8, 5)])
+        self.assertEqual(len(attempts), 2)
+
+    def test_order_auto_assign_without_free_block(self):
+        Ticket.objects.bulk_create(
+            Ticket(row=row, seat=3, flight=self.flight)
+            for row in range(1, self.flight.airplane.rows + 1)
+        )
+
+        response = self.client.post(
+            ORDER_URL,
+            {"auto_assign": {"flight": self.flight.id, "seats": 4}},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["auto_assign"],
+            "No 4 adjacent free seats in one row.",
+        )
+        self.assertFalse(Ticket.objects.filter(seat=4).exists())
+
+    def test_order_auto_assign_validation(self):
+        response = self.client.post(
+            ORDER_URL,
+            {"auto_assign": {"flight": self.flight.id, "seats": 7}},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("seats", response.data["auto_assign"])
+
+        response = self.client.post(
+            ORDER_URL,
+            {
+                "order_tickets": [
+                    {"row": 6, "seat": 1, "flight": self.flight.id}
+                ],
+                "auto_assign": {"flight": self.flight.id, "seats": 2},
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("order_tickets", response.data)
+
+
+class SeatBlockTests(SimpleTestCase):
+    def test_best_block_prefers_shortest_run(self):
+        # Free runs: seats 1-4 and 6-7
+        taken = 0b10010000
+
+        self.assertEqual(best_block(taken, 8, 2), 6)
+        self.assertEqual(best_block(taken, 8, 3), 1)
+        self.assertEqual(best_block(taken, 8, 4), 1)
+
+    def test_best_block_prefers_leftmost_run(self):
+        # Free runs: seats 1-2, 4-5 and 7-8
+        self.assertEqual(best_block(0b00100100, 8, 2), 1)
+        self.assertEqual(best_block(0b00100101, 8, 2), 4)
+
+    def test_best_block_without_fit(self):
+        self.assertIsNone(best_block(0b10010000, 8, 5))
+        self.assertIsNone(best_block(0b111111, 6, 1))
+        self.assertIsNone(best_block(0, 6, 7))
+        self.assertEqual(best_block(0, 6, 6), 1)
@@ -6,10 +6,12 @@ from airport.views import (
     CrewViewSet,
     RouteViewSet,
     AirportViewSet,
+    CityViewSet,
     AirplaneViewSet,
     AirplaneTypeViewSet,
     TicketViewSet,
     OrderViewSet,
+    OrderRequestViewSet,
 )
 
 
@@ -21,6 +23,7 @@ router.register("flights", FlightViewSet, basename="flight")
 router.register("crews", CrewViewSet, basename="crew")
 router.register("routes", RouteViewSet, basename="route")
 router.register("airports", AirportViewSet, basename="airport")
+router.register("cities", CityViewSet, basename="city")
 router.register("airplanes", AirplaneViewSet, basename="airplane")
 router.register(
     "airplane-types",
@@ -29,5 +32,10 @@ router.register(
 )
 router.register("tickets", TicketViewSet, basename="ticket")
 router.register("orders", OrderViewSet, basename="order")
+router.register(
+    "order-requests",
+    OrderRequestViewSet,
+    basename="order-request"
+)
 
 urlpatterns = router.urls
@@ -1,8 +1,14 @@
-from django.db.models import Count, F
+from functools import partial
+
+from django.conf import settings
+from django.db.models import F
 from django_filters import rest_framework as filters
 from drf_spectacular.utils import extend_schema
-from rest_framework import viewsets
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
 from airport.filters import (
     FlightFilter,
@@ -13,6 +19,7 @@ from airport.filters import (
     TicketFilter,
     OrderFilter
 )
+from airport.mixins import CachedResponseMixin, ConditionalGetMixin
 from airport.models import (
     Flight,
     Crew,
@@ -22,27 +29,54 @@ from airport.models import (
     AirplaneType,
     Ticket,
     Order,
+    OrderRequest,
+)
+from airport.pagination import (
+    ApproximateCountPagination,
+    FlightPagination,
+    TicketPagination,
+    OrderPagination,
 )
-from airport.pagination import StandardResultsSetPagination
 from airport.permissions import IsAdminOrIfAuthenticatedReadOnly
 from airport.schema_params import (
     FLIGHT_LIST_PARAMETERS,
     CREW_LIST_PARAMETERS,
     ROUTE_LIST_PARAMETERS,
+    ROUTE_DISTANCE_MATRIX_PARAMETERS,
+    ROUTE_CALENDAR_PARAMETERS,
     AIRPORT_LIST_PARAMETERS,
+    AIRPORT_NEARBY_PARAMETERS,
+    AIRPORT_BOARD_PARAMETERS,
+    CITY_AUTOCOMPLETE_PARAMETERS,
     AIRPLANE_LIST_PARAMETERS,
     TICKET_LIST_PARAMETERS,
-    ORDER_LIST_PARAMETERS
+    ORDER_LIST_PARAMETERS,
+    ORDER_CREATE_PARAMETERS,
 )
 from airport.serializers import (
     FlightSerializer,
     FlightDetailSerializer,
     FlightListSerializer,
+    FlightBoardSerializer,
+    FlightSeatMapSerializer,
+    SeatHoldCreateSerializer,
+    SeatHoldSerializer,
     CrewSerializer,
     RouteSerializer,
     RouteDetailSerializer,
     RouteListSerializer,
+    RouteDistanceMatrixQuerySerializer,
+    RouteDistanceMatrixSerializer,
+    RouteCalendarQuerySerializer,
+    RouteCalendarDaySerializer,
     AirportSerializer,
+    AirportNearbyQuerySerializer,
+    AirportNearbySerializer,
+    AirportBoardQuerySerializer,
+    AirportImportSerializer,
+    AirportImportResultSerializer,
+    CityAutocompleteQuerySerializer,
+    CitySerializer,
     AirplaneSerializer,
     AirplaneTypeSerializer,
     TicketSerializer,
@@ -50,16 +84,40 @@ from airport.serializers import (
     TicketListSerializer,
     OrderSerializer,
     OrderListSerializer,
+    OrderIntakeSerializer,
+    OrderRequestSerializer,
 )
-
-
-class FlightViewSet(viewsets.ModelViewSet):
+from airport.services.airport_board import get_board
+from airport.services.airport_import import import_airports, read_csv
+from airport.services.idempotency import run_idempotent
+from airport.services.order_queue import enqueue_order
+from airport.services.route_calendar import get_calendar
+from airport.services.seat_holds import create_hold
+from airport.services.utils.city_autocomplete import get_city_autocomplete
+from airport.services.utils.distance_matrix import distance_matrix
+from airport.services.utils.seat_bitset import encode_bitset, pack_seats
+from airport.services.utils.spatial_index import airport_index
+
+
+class FlightViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    etag_fields = (
+        "updated_at",
+        "route__source__updated_at",
+        "route__destination__updated_at",
+        "airplane__updated_at",
+        "airplane__airplane_type__updated_at",
+        "crew__updated_at",
+    )
+    etag_models = (Flight, Route, Airport, Airplane, AirplaneType, Crew)
     filter_backends = (filters.DjangoFilterBackend,)
     filterset_class = FlightFilter
-    pagination_class = StandardResultsSetPagination
+    pagination_class = FlightPagination
 
     def get_queryset(self):
+        if self.action in ("seat_map", "holds"):
+            return Flight.objects.select_related("airplane")
+
         self.queryset = Flight.objects.select_related(
             "route__source",
             "route__destination",
@@ -70,7 +128,7 @@ class FlightViewSet(viewsets.ModelViewSet):
             return self.queryset.annotate(
                 tickets_available=F("airplane__rows")
                 * F("airplane__seats_in_row")
-                - Count("flight_tickets")
+                - F("seats_sold")
             ).order_by("id")
 
         return self.queryset
@@ -91,14 +149,76 @@ class FlightViewSet(viewsets.ModelViewSet):
 
         return FlightSerializer
 
+    @extend_schema(responses=FlightSeatMapSerializer)
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="seat-map",
+        url_name="seat-map",
+    )
+    def seat_map(self, request, pk=None):
+        """Get taken seats of a flight packed into a bitset"""
+        flight = self.get_object()
+        airplane = flight.airplane
+        seats = list(flight.flight_tickets.values_list("row", "seat"))
+
+        serializer = FlightSeatMapSerializer({
+            "rows": airplane.rows,
+            "seats_in_row": airplane.seats_in_row,
+            "seats_taken": len(seats),
+            "taken": encode_bitset(
+                pack_seats(seats, airplane.rows, airplane.seats_in_row)
+            ),
+        })
+
+        return Response(serializer.data)
 
-class CrewViewSet(viewsets.ModelViewSet):
+    @extend_schema(
+        request=SeatHoldCreateSerializer,
+        responses={status.HTTP_201_CREATED: SeatHoldSerializer},
+    )
+    @action(
+        detail=True,
+        methods=["post"],
+        permission_classes=(IsAuthenticated,),
+    )
+    def holds(self, request, pk=None):
+        """Hold seats of a flight for a few minutes before ordering them"""
+        serializer = SeatHoldCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        seats = serializer.validated_data["seats"]
+        flight = self.get_object()
+
+        for row, seat in seats:
+            Ticket.validate_ticket(
+                row, seat, flight.airplane, ValidationError
+            )
+
+        token, expires_at = create_hold(
+            flight,
+            seats,
+            request.user,
+            serializer.validated_data["minutes"],
+        )
+        result = SeatHoldSerializer({
+            "token": token,
+            "expires_at": expires_at,
+            "seats": [{"row": row, "seat": seat} for row, seat in seats],
+        })
+
+        return Response(result.data, status=status.HTTP_201_CREATED)
+
+
+class CrewViewSet(
+    ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet
+):
     queryset = Crew.objects.all()
     serializer_class = CrewSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_models = (Crew,)
     filter_backends = (filters.DjangoFilterBackend,)
     filterset_class = CrewFilter
-    pagination_class = StandardResultsSetPagination
+    pagination_class = ApproximateCountPagination
 
     @extend_schema(
         parameters=CREW_LIST_PARAMETERS
@@ -108,12 +228,22 @@ class CrewViewSet(viewsets.ModelViewSet):
         return super().list(request, *args, **kwargs)
 
 
-class RouteViewSet(viewsets.ModelViewSet):
-    queryset = Route.objects.select_related("source", "destination")
+class RouteViewSet(
+    ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet
+):
+    queryset = Route.objects.select_related(
+        "source", "destination"
+    ).order_by("id")
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_models = (Route, Airport)
+    etag_fields = (
+        "updated_at",
+        "source__updated_at",
+        "destination__updated_at",
+    )
     filter_backends = (filters.DjangoFilterBackend,)
     filterset_class = RouteFilter
-    pagination_class = StandardResultsSetPagination
+    pagination_class = ApproximateCountPagination
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -131,14 +261,76 @@ class RouteViewSet(viewsets.ModelViewSet):
         """Get list of routes"""
         return super().list(request, *args, **kwargs)
 
+    @extend_schema(
+        parameters=ROUTE_DISTANCE_MATRIX_PARAMETERS,
+        responses=RouteDistanceMatrixSerializer,
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="distance-matrix",
+        url_name="distance-matrix",
+    )
+    def pairwise_distances(self, request):
+        """Get distances in km between every pair of the given airports"""
+        query = RouteDistanceMatrixQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        airport_ids = query.validated_data["ids"]
+
+        airports = list(
+            Airport.objects.filter(
+                id__in=airport_ids,
+                latitude__isnull=False,
+                longitude__isnull=False,
+            ).only("id", "latitude", "longitude")
+        )
+        distance_matrix.sync(airports)
+
+        known_ids = {airport.id for airport in airports}
+        unknown_ids = [
+            airport_id for airport_id in airport_ids
+            if airport_id not in known_ids
+        ]
+
+        if unknown_ids:
+            raise ValidationError(
+                {"ids": f"Unknown airports: {unknown_ids}"}
+            )
+
+        distances = distance_matrix.get_submatrix(airport_ids)
+        serializer = RouteDistanceMatrixSerializer({
+            "ids": airport_ids,
+            "distances": distances.astype(float).round(1).tolist(),
+        })
+
+        return Response(serializer.data)
+
+    @extend_schema(
+        parameters=ROUTE_CALENDAR_PARAMETERS,
+        responses=RouteCalendarDaySerializer(many=True),
+    )
+    @action(detail=True, methods=["get"])
+    def calendar(self, request, pk=None):
+        """Get flights and available seats of a route per day of a month"""
+        query = RouteCalendarQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        route = self.get_object()
+
+        days = get_calendar(route.id, query.validated_data["month"])
+
+        return Response(RouteCalendarDaySerializer(days, many=True).data)
+
 
-class AirportViewSet(viewsets.ModelViewSet):
+class AirportViewSet(
+    ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet
+):
     queryset = Airport.objects.all()
     serializer_class = AirportSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_models = (Airport,)
     filter_backends = (filters.DjangoFilterBackend,)
     filterset_class = AirportFilter
-    pagination_class = StandardResultsSetPagination
+    pagination_class = ApproximateCountPagination
 
     @extend_schema(
         parameters=AIRPORT_LIST_PARAMETERS
@@ -147,14 +339,132 @@ class AirportViewSet(viewsets.ModelViewSet):
         """Get list of airports"""
         return super().list(request, *args, **kwargs)
 
+    @extend_schema(
+        parameters=AIRPORT_NEARBY_PARAMETERS,
+        responses=AirportNearbySerializer(many=True),
+    )
+    @action(detail=False, methods=["get"])
+    def nearby(self, request):
+        """Get airports within a radius of a point, nearest first"""
+        query = AirportNearbyQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        found = airport_index.get().query_radius(
+            lat=params["lat"],
+            lng=params["lng"],
+            radius=params["radius"],
+            limit=params["limit"],
+        )
+        airports = Airport.objects.in_bulk(
+            [airport_id for _, airport_id in found]
+        )
+        nearby_airports = []
+
+        for distance, airport_id in found:
+            airport = airports.get(airport_id)
+
+            if airport is not None:
+                airport.distance = round(distance, 1)
+                nearby_airports.append(airport)
+
+        serializer = AirportNearbySerializer(nearby_airports, many=True)
+
+        return Response(serializer.data)
+
+    def get_board_response(self, request, direction):
+        query = AirportBoardQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        airport = self.get_object()
+
+        return Response(
+            get_board(airport.id, direction, **query.validated_data)
+        )
+
+    @extend_schema(
+        parameters=AIRPORT_BOARD_PARAMETERS,
+        responses=FlightBoardSerializer(many=True),
+    )
+    @action(detail=True, methods=["get"])
+    def departures(self, request, pk=None):
+        """Get next departures from the airport"""
+        return self.get_board_response(request, "departures")
+
+    @extend_schema(
+        parameters=AIRPORT_BOARD_PARAMETERS,
+        responses=FlightBoardSerializer(many=True),
+    )
+    @action(detail=True, methods=["get"])
+    def arrivals(self, request, pk=None):
+        """Get next arrivals to the airport"""
+        return self.get_board_response(request, "arrivals")
+
+    @extend_schema(
+        request=AirportImportSerializer,
+        responses=AirportImportResultSerializer,
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        url_name="import",
+    )
+    def bulk_import(self, request):
+        """Import airports from a JSON list or a CSV file"""
+        if "file" in request.FILES:
+            upload = AirportImportSerializer(data=request.data)
+            upload.is_valid(raise_exception=True)
+            rows = read_csv(upload.validated_data["file"])
+        elif isinstance(request.data, list):
+            rows = request.data
+        else:
+            raise ValidationError(
+                "Send a list of airports or a CSV file in the `file` field."
+            )
+
+        report = import_airports(rows)
+
+        return Response(
+            AirportImportResultSerializer(report).data,
+            status=(
+                status.HTTP_201_CREATED if report["created"]
+                else status.HTTP_200_OK
+            ),
+        )
+
+
+class CityViewSet(viewsets.ViewSet):
+    permission_classes = (IsAuthenticated,)
+
+    @extend_schema(
+        parameters=CITY_AUTOCOMPLETE_PARAMETERS,
+        responses=CitySerializer(many=True),
+    )
+    @action(detail=False, methods=["get"])
+    def autocomplete(self, request):
+        """Suggest cities by the beginning of their name"""
+        query = CityAutocompleteQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        cities = get_city_autocomplete().search(
+            query.validated_data["q"],
+            limit=query.validated_data["limit"],
+        )
+
+        return Response(CitySerializer(cities, many=True).data)
+
 
-class AirplaneViewSet(viewsets.ModelViewSet):
+class AirplaneViewSet(
+    ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet
+):
     queryset = Airplane.objects.select_related("airplane_type")
     serializer_class = AirplaneSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_models = (Airplane, AirplaneType)
+    etag_fields = ("updated_at", "airplane_type__updated_at")
     filter_backends = (filters.DjangoFilterBackend,)
     filterset_class = AirplaneFilter
-    pagination_class = StandardResultsSetPagination
+    pagination_class = ApproximateCountPagination
 
     @extend_schema(
         parameters=AIRPLANE_LIST_PARAMETERS
@@ -164,10 +474,13 @@ class AirplaneViewSet(viewsets.ModelViewSet):
         return super().list(request, *args, **kwargs)
 
 
-class AirplaneTypeViewSet(viewsets.ModelViewSet):
+class AirplaneTypeViewSet(
+    ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet
+):
     queryset = AirplaneType.objects.all()
     serializer_class = AirplaneTypeSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_models = (AirplaneType,)
 
 
 class TicketViewSet(viewsets.ModelViewSet):
@@ -183,7 +496,7 @@ class TicketViewSet(viewsets.ModelViewSet):
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
     filter_backends = (filters.DjangoFilterBackend,)
     filterset_class = TicketFilter
-    pagination_class = StandardResultsSetPagination
+    pagination_class = TicketPagination
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -211,11 +524,40 @@ class OrderViewSet(viewsets.ModelViewSet):
     permission_classes = (IsAuthenticated,)
     filter_backends = (filters.DjangoFilterBackend,)
     filterset_class = OrderFilter
-    pagination_class = StandardResultsSetPagination
+    pagination_class = OrderPagination
 
     def get_queryset(self):
         return self.queryset.filter(user=self.request.user)
 
+    @extend_schema(parameters=ORDER_CREATE_PARAMETERS)
+    def create(self, request, *args, **kwargs):
+        """Create an order, or queue it if ORDER_ASYNC_INTAKE is on"""
+        if settings.ORDER_ASYNC_INTAKE:
+            handler = partial(self.enqueue, request)
+        else:
+            handler = partial(super().create, request, *args, **kwargs)
+
+        key = request.headers.get("Idempotency-Key")
+
+        if not key:
+            return handler()
+
+        return run_idempotent(request, key, handler)
+
+    def enqueue(self, request):
+        serializer = OrderIntakeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        order_request = enqueue_order(request.user, serializer.data)
+        data = OrderRequestSerializer(
+            order_request, context=self.get_serializer_context()
+        ).data
+
+        return Response(
+            data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": data["url"]},
+        )
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
@@ -231,3 +573,16 @@ class OrderViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         """Get list of orders"""
         return super().list(request, *args, **kwargs)
+
+
+class OrderRequestViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    queryset = OrderRequest.objects.all()
+    serializer_class = OrderRequestSerializer
+    permission_classes = (IsAuthenticated,)
+
+    def get_queryset(self):
+        return self.queryset.filter(user=self.request.user)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Get status of a queued order"""
+        return super().retrieve(request, *args, **kwargs)
@@ -116,6 +116,42 @@ else:
     }
 
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "responses": {
+        "BACKEND": os.getenv(
+            "RESPONSE_CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("RESPONSE_CACHE_LOCATION", "responses"),
+        "TIMEOUT": int(os.getenv("RESPONSE_CACHE_TIMEOUT", 300)),
+    },
+}
+
+RESPONSE_CACHE_ALIAS = "responses"
+
+SEAT_INVENTORY_BACKEND = os.getenv(
+    "SEAT_INVENTORY_BACKEND",
+    "airport.services.seat_inventory.LocalSeatInventory"
+)
+
+SEAT_INVENTORY_CACHE_ALIAS = "default"
+
+SEAT_INVENTORY_TIMEOUT = int(os.getenv("SEAT_INVENTORY_TIMEOUT", 86400))
+
+SEAT_RESERVATION_TIMEOUT = int(os.getenv("SEAT_RESERVATION_TIMEOUT", 60))
+
+IDEMPOTENCY_KEY_TTL = int(os.getenv("IDEMPOTENCY_KEY_TTL", 86400))
+
+IDEMPOTENCY_LOCK_TIMEOUT = int(os.getenv("IDEMPOTENCY_LOCK_TIMEOUT", 60))
+
+ORDER_ASYNC_INTAKE = os.getenv("ORDER_ASYNC_INTAKE", "False") == "True"
+
+ORDER_QUEUE_CLAIM_TIMEOUT = int(os.getenv("ORDER_QUEUE_CLAIM_TIMEOUT", 300))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 